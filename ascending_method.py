@@ -14,18 +14,61 @@ anwendbar! Bitte suchen Sie einen Audiologen auf!
 """
 
 import sys
+import atexit
 import logging
+import logging.handlers
 import time
 import threading
+import queue
 import random
+from collections import Counter, deque
 from typing import Optional, Callable
 from audiometer import controller
 from audiometer import audiogram
 
 
-logging.basicConfig(level=logging.DEBUG, format='%(levelname)s:%(message)s',
-                    handlers=[logging.FileHandler("logfile.log", 'w'),
-                              logging.StreamHandler()])
+# Log records are only enqueued on the calling thread; a background
+# listener does the formatting and the file/console I/O, so logging in the
+# tone loop never blocks on a write.
+_log_queue = queue.Queue(-1)
+_log_formatter = logging.Formatter('%(levelname)s:%(message)s')
+_log_handlers = [logging.FileHandler("logfile.log", 'w', delay=True),
+                 logging.StreamHandler()]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+logging.basicConfig(level=logging.DEBUG, handlers=[_queue_handler])
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+logger = logging.getLogger(__name__)
+
+
+def _set_timer_resolution(enable):
+    """Request (or release) 1 ms timer resolution on Windows.
+
+    The default Windows timer tick is ~15.6 ms, which makes the short
+    pauses between tones overshoot. No-op on other platforms.
+
+    Args:
+        enable: True to call timeBeginPeriod(1), False for timeEndPeriod(1).
+    """
+    if sys.platform != 'win32':
+        return
+    try:
+        import ctypes
+        winmm = ctypes.WinDLL('winmm')
+        if enable:
+            winmm.timeBeginPeriod(1)
+        else:
+            winmm.timeEndPeriod(1)
+    except Exception as e:
+        logger.debug("Could not change timer resolution: %s", e)
+
+
+class TestStopped(Exception):
+    """Raised internally when the stop event interrupts a frequency test."""
 
 
 class AscendingMethod:
@@ -43,11 +86,26 @@ class AscendingMethod:
         - Audio is properly stopped between tests
         - State is completely isolated between ears
     """
+
+    # Fixed slots for the attributes read on every tone presentation.
+    # '__dict__' stays so callers (and tests) can still override methods
+    # such as hearing_test on an instance.
+    __slots__ = ('ctrl', 'current_level', 'click', 'freq', 'earside',
+                 'stop_event', '_total_steps', '_step_scale', '_completed_steps',
+                 '_current_step', '_current_freq', '_current_earside',
+                 '_sub_step_counter', '_progress_callback',
+                 '_ear_change_callback', '_freq_change_callback', '_rng',
+                 '_cb_queue', '_cb_thread', '_audio_stopped',
+                 '_cached_progress', '_cached_progress_key',
+                 '_last_posted_pct', '_last_post_time', '_trace', '__dict__')
     
     # Estimated average number of tone plays to find a threshold per frequency
     # Used for granular progress calculation
     ESTIMATED_TRIALS_PER_FREQ = 15
     
+    # Minimum spacing (seconds) between in-frequency progress updates
+    PROGRESS_MIN_INTERVAL = 0.05
+    
     def __init__(self, device_id=None, subject_name=None, progress_callback=None, ear_change_callback=None, freq_change_callback=None, quick_mode: bool = False, mini_mode: bool = False):
         """Initialize the ascending method test.
         
@@ -72,31 +130,56 @@ class AscendingMethod:
         # Test state (reset for each frequency)
         self.current_level = 0
         self.click = True
+        self._audio_stopped = False
         self.freq = None
         self.earside = None
         
         # Progress tracking state
         # Calculate total steps: number of frequencies × number of ears
         self._total_steps = len(self.ctrl.config.earsides) * len(self.ctrl.config.freqs)
+        # Percent of the whole test one step is worth; multiplied rather
+        # than dividing by _total_steps on every progress update
+        self._step_scale = 100.0 / self._total_steps if self._total_steps else 0.0
         self._completed_steps = 0
         self._current_step = 0  # Track current step for progress calculation
         self._current_freq = None
         self._current_earside = None
+        # Last (completed, total, percentage) tuple handed out by
+        # get_progress(), keyed on the counters it was computed from
+        self._cached_progress = (0, 0, 0)
+        self._cached_progress_key = None
+        # Last whole percentage pushed to the progress callback / UI, and
+        # when (time.monotonic()) it was pushed
+        self._last_posted_pct = -1
+        self._last_post_time = 0.0
         self._progress_callback: Optional[Callable[[float], None]] = progress_callback
         self._ear_change_callback: Optional[Callable[[str], None]] = ear_change_callback
         self._freq_change_callback: Optional[Callable[[int], None]] = freq_change_callback
         
+        # Callbacks are delivered by a worker thread so a slow UI never
+        # delays the next tone presentation (started lazily, see
+        # _dispatch_callback)
+        self._cb_queue: queue.Queue = queue.Queue()
+        self._cb_thread: Optional[threading.Thread] = None
+        
         # Stop event for graceful test termination
         self.stop_event = threading.Event()
         
+        # Signed level steps (dB) taken for the current frequency; logged
+        # as one line per frequency instead of one line per tone
+        self._trace = deque()
+        
         # Pass stop_event to controller so it can check during sleeps
         self.ctrl.stop_event = self.stop_event
         
-        # Randomize ear order (Task 2) - shuffle to prevent patient prediction
+        # Randomize ear order (Task 2) - shuffle to prevent patient prediction.
+        # A private generator keeps the shuffle independent of (and from
+        # contending with) the process-wide random state.
+        self._rng = random.Random()
         self._randomize_ear_order()
         # DEBUG: Log initial ear sequence for traceability
         try:
-            logging.info(f"DEBUG: Initial ear sequence: {self.ctrl.config.earsides}")
+            logger.debug("Initial ear sequence: %s", self.ctrl.config.earsides)
         except Exception:
             pass
     
@@ -107,13 +190,65 @@ class AscendingMethod:
         The test will check this event in its loops and exit cleanly.
         """
         self.stop_event.set()
-        # Also stop audio immediately if possible
+        # Stop audio on a short-lived worker so a backend that blocks while
+        # draining its buffer cannot freeze the calling (UI) thread
+        threading.Thread(target=self._do_audio_stop, name='AscendingMethodStop',
+                         daemon=True).start()
+
+    def _do_audio_stop(self):
+        """Stop audio playback, ignoring errors; runs on a worker thread."""
         try:
             if hasattr(self.ctrl, '_audio') and self.ctrl._audio:
                 self.ctrl._audio.stop()
         except Exception:
             pass
 
+    def _pause(self, secs):
+        """Pause for ``secs`` seconds, returning early if a stop is requested.
+
+        A single wait on the stop event: it wakes as soon as the event is
+        set, and its timeout runs on the monotonic clock, so wall-clock
+        changes do not stretch or cut short the pause.
+
+        Args:
+            secs: Pause length in seconds.
+
+        Returns:
+            True if the full pause elapsed, False if a stop was requested.
+        """
+        return not self.stop_event.wait(secs)
+
+    def _cb_worker(self):
+        """Deliver queued callbacks in order until the None sentinel arrives."""
+        while True:
+            item = self._cb_queue.get()
+            if item is None:
+                return
+            fn, arg = item
+            try:
+                fn(arg)
+            except Exception as e:
+                logger.warning("Error calling callback %r: %s", fn, e)
+
+    def _dispatch_callback(self, fn, arg):
+        """Queue ``fn(arg)`` for the callback worker, starting it if needed."""
+        if fn is None:
+            return
+        if self._cb_thread is None:
+            self._cb_thread = threading.Thread(target=self._cb_worker,
+                                               name='AscendingMethodCallbacks',
+                                               daemon=True)
+            self._cb_thread.start()
+        self._cb_queue.put((fn, arg))
+
+    def _flush_callbacks(self):
+        """Wait for all queued callbacks to run, then retire the worker."""
+        if self._cb_thread is None:
+            return
+        self._cb_queue.put(None)
+        self._cb_thread.join()
+        self._cb_thread = None
+
     def _randomize_ear_order(self):
         """Randomize the order of ears to prevent patient prediction (Task 2).
         
@@ -124,9 +259,9 @@ class AscendingMethod:
             # Fully shuffle the ear order so each test run may use any
             # arbitrary ear sequence. This prevents predictability.
             earsides_list = list(self.ctrl.config.earsides)
-            random.shuffle(earsides_list)
+            self._rng.shuffle(earsides_list)
             self.ctrl.config.earsides = earsides_list
-            logging.info(f"Randomized ear order: {earsides_list}")
+            logger.info("Randomized ear order: %s", earsides_list)
 
     def _reset_state_for_new_frequency(self):
         """Reset all state variables for a new frequency/ear test.
@@ -137,6 +272,7 @@ class AscendingMethod:
         # Reset test state
         self.current_level = 0
         self.click = True
+        self._audio_stopped = False
         
         # Reset granular progress counter for this frequency
         self._sub_step_counter = 0
@@ -149,14 +285,15 @@ class AscendingMethod:
         
         # Ensure audio is stopped
         try:
-            if hasattr(self.ctrl._audio, '_target_gain') and self.ctrl._audio._target_gain != 0:
-                self.ctrl._audio.stop()
-                # Brief pause to ensure audio stops (check stop_event)
-                self.ctrl._progress_sleep(0.1, self.stop_event)
+            audio = self.ctrl._audio
+            if audio and audio.is_playing():
+                audio.stop()
+                # Brief pause to ensure audio stops (returns early on stop)
+                self._pause(0.1)
         except Exception:
             pass
         
-        logging.debug(f"State reset for {self.earside} ear at {self.freq} Hz")
+        logger.debug("State reset for %s ear at %s Hz", self.earside, self.freq)
     
     def _report_granular_progress(self, sub_step_count):
         """Report granular progress within a frequency test.
@@ -167,24 +304,48 @@ class AscendingMethod:
         Args:
             sub_step_count: Number of sub-steps (tone plays) completed in current frequency
         """
-        if self._total_steps == 0:
+        # step_weight is the share of the whole test one frequency represents
+        step_weight = self._step_scale
+        if not step_weight:
             return
         
         # Calculate base progress (completed frequencies)
-        base_progress = (self._completed_steps / self._total_steps) * 100
+        base_progress = self._completed_steps * step_weight
         
         # Calculate sub-progress (current activity within this frequency)
         # Cap sub-progress at 90% of a single step to prevent overshooting
-        step_weight = 100 / self._total_steps
-        sub_progress = (sub_step_count / self.ESTIMATED_TRIALS_PER_FREQ) * step_weight * 0.9
+        # (a frequency can take more than ESTIMATED_TRIALS_PER_FREQ tones)
+        fraction = min(1.0, sub_step_count / self.ESTIMATED_TRIALS_PER_FREQ)
+        sub_progress = fraction * step_weight * 0.9
         
         total_progress = min(99, base_progress + sub_progress)
         
-        if self._progress_callback:
-            try:
-                self._progress_callback(total_progress)
-            except Exception as e:
-                logging.debug(f"Error calling granular progress callback: {e}")
+        if self._progress_callback and self._should_post_progress(int(total_progress)):
+            self._dispatch_callback(self._progress_callback, total_progress)
+
+    def _should_post_progress(self, pct_int):
+        """Decide whether an in-frequency progress value is worth posting.
+
+        Repeats of the last posted whole percentage are dropped, and so are
+        updates arriving within PROGRESS_MIN_INTERVAL of the previous post.
+        Completed steps do not go through here; _update_progress() always
+        posts them.
+
+        Args:
+            pct_int: Progress as a whole percentage.
+
+        Returns:
+            True if the caller should post; the value is then recorded as
+            the last posted one.
+        """
+        if pct_int == self._last_posted_pct:
+            return False
+        now = time.monotonic()
+        if now - self._last_post_time < self.PROGRESS_MIN_INTERVAL:
+            return False
+        self._last_posted_pct = pct_int
+        self._last_post_time = now
+        return True
 
     def decrement_click(self, level_decrement):
         """Decrement level and test tone.
@@ -194,19 +355,11 @@ class AscendingMethod:
             
         Returns:
             None (modifies self.click state)
+
+        Raises:
+            TestStopped: If the stop event is set before the tone.
         """
-        # Check stop event before proceeding
-        if self.stop_event.is_set():
-            self.ctrl.stop_audio_immediately()
-            return
-        
-        self.current_level -= level_decrement
-        self.click = self.ctrl.clicktone(self.freq, self.current_level,
-                                         self.earside, stop_event=self.stop_event)
-        
-        # Report granular progress after each tone play
-        self._sub_step_counter += 1
-        self._report_granular_progress(self._sub_step_counter)
+        self._step(-level_decrement)
 
     def increment_click(self, level_increment):
         """Increment level and test tone.
@@ -216,20 +369,95 @@ class AscendingMethod:
             
         Returns:
             None (modifies self.click state)
+
+        Raises:
+            TestStopped: If the stop event is set before the tone.
         """
-        # Check stop event before proceeding
-        if self.stop_event.is_set():
-            self.ctrl.stop_audio_immediately()
-            return
-        
-        self.current_level += level_increment
+        self._step(level_increment)
+
+    def _step(self, delta):
+        """Present one tone ``delta`` dB away from the current level.
+
+        Does exactly what one iteration of :meth:`_step_until` does: the
+        checkpoint, the trace entry, the tone and the progress report.
+
+        Args:
+            delta: Signed level change in dB.
+
+        Raises:
+            TestStopped: If the stop event is set before the tone.
+        """
+        self._checkpoint()
+        self._trace.append(delta)
+        self.current_level += delta
         self.click = self.ctrl.clicktone(self.freq, self.current_level,
-                                         self.earside, stop_event=self.stop_event)
+                                         self.earside, self.stop_event)
         
         # Report granular progress after each tone play
         self._sub_step_counter += 1
         self._report_granular_progress(self._sub_step_counter)
 
+    def _flush_trace(self):
+        """Log the level steps taken for the current frequency and reset them."""
+        trace = self._trace
+        if trace and logger.isEnabledFor(logging.INFO):
+            logger.info("trace freq=%s ear=%s: %s",
+                        self.freq, self.earside, list(trace))
+        trace.clear()
+
+    def _checkpoint(self):
+        """Abort the current frequency test if a stop was requested.
+
+        Raises:
+            TestStopped: If the stop event is set. Audio is stopped first
+                (once per frequency test).
+        """
+        if self.stop_event.is_set():
+            # Only the first checkpoint to see the stop touches the device;
+            # later ones (e.g. familiarization, then hearing_test) just unwind
+            if not self._audio_stopped:
+                self._audio_stopped = True
+                self.ctrl.stop_audio_immediately()
+            raise TestStopped
+
+    def _step_until(self, sign, step, bound, target_click, label):
+        """Present tones in fixed steps until the response matches.
+
+        Args:
+            sign: +1 to step louder, -1 to step quieter.
+            step: Step size in dB.
+            bound: Safety limit in dBHL; stepping stops once it is passed.
+            target_click: Response that ends the loop (False while
+                descending, True while ascending).
+            label: Phase name used in log messages.
+
+        Raises:
+            TestStopped: If the stop event is set between tones.
+        """
+        chk = self._checkpoint
+        clicktone = self.ctrl.clicktone
+        report = self._report_granular_progress
+        freq = self.freq
+        earside = self.earside
+        stop_event = self.stop_event
+        trace_append = self._trace.append
+        delta = sign * step
+
+        while self.click != target_click:
+            chk()
+            trace_append(delta)
+            self.current_level += delta
+            self.click = clicktone(freq, self.current_level, earside, stop_event)
+            self._sub_step_counter += 1
+            report(self._sub_step_counter)
+            chk()
+
+            # Safety check: stay within [-10, 100] dBHL
+            if (self.current_level > bound) if sign > 0 else (self.current_level < bound):
+                logger.warning("%s reached %s level, stopping",
+                               label, 'maximum' if sign > 0 else 'minimum')
+                break
+
     def familiarization(self):
         """Familiarization phase: find initial audibility threshold.
         
@@ -241,8 +469,14 @@ class AscendingMethod:
         2. Waits for user confirmation click
         3. Uses large steps to refine approximate threshold
         """
-        print("DEBUG: Starting Familiarization...")
-        logging.info("Begin Familiarization")
+        chk = self._checkpoint
+        # Config values are constant for the whole test; read them once
+        cfg = self.ctrl.config
+        fam_level = cfg.beginning_fam_level
+        large_dec = cfg.large_level_decrement
+        large_inc = cfg.large_level_increment
+        logger.debug("Starting familiarization")
+        logger.info("Begin Familiarization")
         
         print(f"\n{'='*60}")
         print(f"FAMILIARIZATION: {self.earside.upper()} ear at {self.freq} Hz")
@@ -250,92 +484,44 @@ class AscendingMethod:
         print("Starting automatic tone familiarization...")
         print("Press the button when you hear the tone.\n")
 
-        # Find initial audibility threshold using audibletone()
-        # This returns the level where patient first responds
-        print(f"DEBUG: Calling audibletone() with freq={self.freq}, level={self.ctrl.config.beginning_fam_level}, earside={self.earside}")
-        self.current_level = self.ctrl.audibletone(
-                             self.freq,
-                             self.ctrl.config.beginning_fam_level,
-                             self.earside,
-                             stop_event=self.stop_event)
-        print(f"DEBUG: audibletone() returned level: {self.current_level} dBHL")
-        
-        # Check stop event after audibletone
-        if self.stop_event.is_set():
-            self.ctrl.stop_audio_immediately()
-            return
-
-        print(f"\nInitial threshold found at {self.current_level} dBHL")
-        print("To begin the hearing test, click once")
-        print("DEBUG: Waiting for user response (wait_for_click_down_and_up)...")
-        
-        # Wait for click with timeout and stop_event checking
-        # Use a timeout so we can check stop_event periodically
-        if not self.stop_event.is_set():
-            clicked = self.ctrl._rpd.wait_for_click_down_and_up(timeout=30.0)
-            print(f"DEBUG: wait_for_click_down_and_up returned: {clicked}")
-            if not clicked and self.stop_event.is_set():
-                print("DEBUG: Timeout or stop requested, stopping audio")
-                self.ctrl.stop_audio_immediately()
-                return
-            # Also check stop_event even if clicked
-            if self.stop_event.is_set():
-                print("DEBUG: Stop event set after click, stopping audio")
-                self.ctrl.stop_audio_immediately()
-                return
-        else:
-            print("DEBUG: Stop event already set, skipping wait for click")
-
-        # Large steps to refine approximate threshold
-        # Decrement (go quieter) if patient still responds
-        while self.click:
-            # Check stop event at start of loop
-            if self.stop_event.is_set():
-                self.ctrl.stop_audio_immediately()
-                break
-            
-            logging.info("Familiarization: -%s dB", self.ctrl.config.large_level_decrement)
-            self.decrement_click(self.ctrl.config.large_level_decrement)
-            
-            # Report granular progress during familiarization
-            self._sub_step_counter += 1
-            self._report_granular_progress(self._sub_step_counter)
-            
-            # Check stop event after decrement
-            if self.stop_event.is_set():
-                self.ctrl.stop_audio_immediately()
-                break
-            
-            # Safety check: don't go below -10 dBHL (very quiet)
-            if self.current_level < -10:
-                logging.warning("Familiarization reached minimum level, stopping decrement")
-                break
-
-        # Increment (go louder) if patient doesn't respond
-        while not self.click:
-            # Check stop event at start of loop
-            if self.stop_event.is_set():
-                self.ctrl.stop_audio_immediately()
-                break
-            
-            logging.info("Familiarization: +%s dB", self.ctrl.config.large_level_increment)
-            self.increment_click(self.ctrl.config.large_level_increment)
-            
-            # Report granular progress during familiarization
-            self._sub_step_counter += 1
-            self._report_granular_progress(self._sub_step_counter)
-            
-            # Check stop event after increment
-            if self.stop_event.is_set():
-                self.ctrl.stop_audio_immediately()
-                break
+        try:
+            # Find initial audibility threshold using audibletone()
+            # This returns the level where patient first responds
+            logger.debug("Calling audibletone() with freq=%s, level=%s, earside=%s",
+                         self.freq, fam_level, self.earside)
+            self.current_level = self.ctrl.audibletone(
+                                 self.freq,
+                                 fam_level,
+                                 self.earside,
+                                 stop_event=self.stop_event)
+            logger.debug("audibletone() returned level: %s dBHL", self.current_level)
+            chk()
+
+            print(f"\nInitial threshold found at {self.current_level} dBHL")
+            print("To begin the hearing test, click once")
+            logger.debug("Waiting for user response (wait_for_click_down_and_up)")
             
-            # Safety check: don't exceed 100 dBHL (very loud)
-            if self.current_level > 100:
-                logging.warning("Familiarization reached maximum level, stopping increment")
-                break
+            # Wait up to 30s for the click in 0.5s slices so a stop request
+            # is honoured within half a second instead of after the timeout
+            wait_click = self.ctrl._rpd.wait_for_click_down_and_up
+            clicked = False
+            deadline = time.monotonic() + 30.0
+            while not clicked and time.monotonic() < deadline:
+                chk()
+                clicked = wait_click(timeout=0.5)
+            logger.debug("wait_for_click_down_and_up returned: %s", clicked)
+            chk()
+
+            # Large steps to refine approximate threshold:
+            # decrement (go quieter) while the patient still responds,
+            # then increment (go louder) until they respond again
+            self._step_until(-1, large_dec, -10, False, "Familiarization")
+            self._step_until(+1, large_inc, 100, True, "Familiarization")
+        except TestStopped:
+            logger.info("Stop requested during familiarization")
+            return
         
-        logging.info(f"Familiarization complete. Starting level: {self.current_level} dBHL")
+        logger.info("Familiarization complete. Starting level: %s dBHL", self.current_level)
 
     def hearing_test(self):
         """Main hearing test using Modified Hughson-Westlake method.
@@ -350,160 +536,95 @@ class AscendingMethod:
             - 5 dB up when patient doesn't respond
             - Threshold = level where 3 of 5 responses occur
         """
+        chk = self._checkpoint
+
         # Start with familiarization phase
         self.familiarization()
 
-        # Begin main test: decrement by small step (10dB down)
-        # This ensures we start below threshold
-        logging.info("End Familiarization: -%s dB", self.ctrl.config.small_level_decrement)
-        self.decrement_click(self.ctrl.config.small_level_decrement)
-        
-        # Check stop event after decrement
-        if self.stop_event.is_set():
-            self.ctrl.stop_audio_immediately()
-            return
-
-        # 5dB up steps until patient responds (ascending to threshold)
-        while not self.click:
-            # Check stop event at start of loop
-            if self.stop_event.is_set():
-                logging.info("DEBUG: Stop event detected in ascending loop")
-                self.ctrl.stop_audio_immediately()
-                return
-            
-            logging.info("Ascending: +%s dB", self.ctrl.config.small_level_increment)
-            self.increment_click(self.ctrl.config.small_level_increment)
-            
-            # Check stop event after increment
-            if self.stop_event.is_set():
-                logging.info("DEBUG: Stop event detected after increment in ascending loop")
-                self.ctrl.stop_audio_immediately()
-                return
-            
-            # Safety check
-            if self.current_level > 100:
-                logging.warning("Reached maximum level during ascending phase")
-                break
-
-        # Initialize level list with first response
-        current_level_list = []
-        current_level_list.append(self.current_level)
-        logging.info(f"First response at {self.current_level} dBHL")
+        cfg = self.ctrl.config
+        dec = cfg.small_level_decrement
+        inc = cfg.small_level_increment
+        large_inc = cfg.large_level_increment
 
-        # Modified Hughson-Westlake: find threshold where 3 of 5 responses occur
-        three_answers = False
-        iteration_count = 0
-        max_iterations = 5  # Safety limit: 5 iterations per ear (10 total for both ears)
-        
-        while not three_answers and iteration_count < max_iterations:
-            # Check stop event at start of outer loop
-            if self.stop_event.is_set():
-                self.ctrl.stop_audio_immediately()
-                return
-            
-            iteration_count += 1
-            logging.info("3of5 check: %s (iteration %d)", current_level_list, iteration_count)
+        try:
+            chk()
+
+            # Begin main test: decrement by small step (10dB down)
+            # This ensures we start below threshold
+            self.decrement_click(dec)
+            chk()
+
+            # 5dB up steps until patient responds (ascending to threshold)
+            self._step_until(+1, inc, 100, True, "Ascending")
+
+            # Initialize level list with first response. The list is kept for
+            # logging only; the running counter answers the 3-of-5 question.
+            current_level_list = [self.current_level]
+            level_counts = Counter(current_level_list)
+            logger.info("First response at %s dBHL", self.current_level)
+
+            # Modified Hughson-Westlake: find threshold where 3 of 5 responses occur
+            three_answers = False
+            iteration_count = 0
+            max_iterations = 5  # Safety limit: 5 iterations per ear (10 total for both ears)
             
-            # Test up to 4 more times (total 5 responses)
-            for x in range(4):
-                # Check stop event at start of inner loop
-                if self.stop_event.is_set():
-                    self.ctrl.stop_audio_immediately()
-                    return
+            while not three_answers and iteration_count < max_iterations:
+                chk()
+                iteration_count += 1
+                logger.info("3of5 check: %s (iteration %d)", current_level_list, iteration_count)
                 
-                # 10dB down if patient responds (go quieter)
-                while self.click:
-                    # Check stop event in while loop
-                    if self.stop_event.is_set():
-                        logging.info("DEBUG: Stop event detected in descending loop")
-                        self.ctrl.stop_audio_immediately()
-                        return
-                    
-                    logging.info("Descending: -%s dB", self.ctrl.config.small_level_decrement)
-                    self.decrement_click(self.ctrl.config.small_level_decrement)
+                # Test up to 4 more times (total 5 responses)
+                for x in range(4):
+                    chk()
                     
-                    # Check stop event after decrement
-                    if self.stop_event.is_set():
-                        logging.info("DEBUG: Stop event detected after decrement in descending loop")
-                        self.ctrl.stop_audio_immediately()
-                        return
+                    # 10dB down if patient responds (go quieter),
+                    # then 5dB up until they respond again (go louder)
+                    self._step_until(-1, dec, -10, False, "Descending")
+                    self._step_until(+1, inc, 100, True, "Ascending")
+
+                    # Record this level
+                    current_level_list.append(self.current_level)
+                    level_counts[self.current_level] += 1
+                    logger.info("3of5 check: %s", current_level_list)
                     
-                    # Safety check
-                    if self.current_level < -10:
-                        logging.warning("Reached minimum level during descending phase")
+                    # Check if we have 3 responses at the same level
+                    if level_counts[self.current_level] >= 3:
+                        three_answers = True
+                        threshold_level = self.current_level
+                        logger.info("3of5 threshold confirmed: %s dBHL", threshold_level)
+                        self.current_level = threshold_level
                         break
-
-                # 5dB up if patient doesn't respond (go louder)
-                while not self.click:
-                    # Check stop event in while loop
-                    if self.stop_event.is_set():
-                        logging.info("DEBUG: Stop event detected in threshold-seeking ascending loop")
-                        self.ctrl.stop_audio_immediately()
-                        return
-                    
-                    logging.info("Ascending: +%s dB", self.ctrl.config.small_level_increment)
-                    self.increment_click(self.ctrl.config.small_level_increment)
-                    
-                    # Check stop event after increment
-                    if self.stop_event.is_set():
-                        logging.info("DEBUG: Stop event detected after increment in threshold-seeking loop")
-                        self.ctrl.stop_audio_immediately()
-                        return
+                
+                chk()
+                
+                # If no 3-of-5 match found, increase level and restart
+                if not three_answers:
+                    logger.info("No 3-of-5 match. Restarting with +%s dB",
+                                 large_inc)
+                    current_level_list = []
+                    level_counts.clear()
+                    self.increment_click(large_inc)
+                    chk()
                     
+                    # Add new starting level to list
+                    current_level_list.append(self.current_level)
+                    level_counts[self.current_level] += 1
                     # Safety check
                     if self.current_level > 100:
-                        logging.warning("Reached maximum level during ascending phase")
+                        logger.warning("Reached maximum level, using current level as threshold")
+                        three_answers = True
                         break
-
-                # Record this level
-                current_level_list.append(self.current_level)
-                logging.info("3of5 check: %s", current_level_list)
-                
-                # Check if we have 3 responses at the same level
-                # http://stackoverflow.com/a/11236055
-                matching_levels = [k for k in current_level_list
-                                 if current_level_list.count(k) == 3]
-                if matching_levels:
-                    three_answers = True
-                    threshold_level = matching_levels[0]
-                    logging.info(f"3of5 threshold confirmed: {threshold_level} dBHL")
-                    self.current_level = threshold_level
-                    break
-            
-            # Check stop event before continuing outer loop
-            if self.stop_event.is_set():
-                self.ctrl.stop_audio_immediately()
-                return
-            
-            # If no 3-of-5 match found, increase level and restart
-            if not three_answers:
-                logging.info("No 3-of-5 match. Restarting with +%s dB",
-                             self.ctrl.config.large_level_increment)
-                current_level_list = []
-                self.increment_click(self.ctrl.config.large_level_increment)
-                
-                # Check stop event after increment
-                if self.stop_event.is_set():
-                    self.ctrl.stop_audio_immediately()
-                    return
-                
-                # Add new starting level to list
-                current_level_list.append(self.current_level)
-                # Safety check
-                if self.current_level > 100:
-                    logging.warning("Reached maximum level, using current level as threshold")
-                    three_answers = True
-                    break
+        except TestStopped:
+            logger.info("Stop requested during hearing test")
+            return
         
         if iteration_count >= max_iterations:
-            logging.warning("Maximum iterations reached. Using last determined level.")
-            # Use the most common level in the list as threshold
-            if current_level_list:
-                from collections import Counter
-                most_common = Counter(current_level_list).most_common(1)
-                if most_common:
-                    self.current_level = most_common[0][0]
-                    logging.info(f"Using most common level as threshold: {self.current_level} dBHL")
+            logger.warning("Maximum iterations reached. Using last determined level.")
+            # Use the most common level as threshold; the running counter
+            # already holds the tallies for the current level list
+            if level_counts:
+                self.current_level = max(level_counts, key=level_counts.get)
+                logger.info("Using most common level as threshold: %s dBHL", self.current_level)
 
     def get_progress(self) -> tuple[int, int, int]:
         """Get current test progress.
@@ -514,15 +635,24 @@ class AscendingMethod:
             - total_steps: Total number of frequency/ear combinations
             - percentage: Progress percentage (0-100)
         """
-        if self._total_steps == 0:
+        # Recompute only when the counters changed (tests or external
+        # callers may adjust _completed_steps/_total_steps directly)
+        key = (self._completed_steps, self._total_steps)
+        if key != self._cached_progress_key:
+            self._cached_progress_key = key
+            self._cached_progress = self._compute_progress(*key)
+        return self._cached_progress
+
+    @staticmethod
+    def _compute_progress(completed_steps, total_steps) -> tuple[int, int, int]:
+        """Build the (completed, total, percentage) tuple for get_progress()."""
+        if total_steps == 0:
             return (0, 0, 0)
 
-        # Use completed steps (tests or external callers may adjust this)
-        completed = int(self._completed_steps)
+        completed = int(completed_steps)
         # Calculate percentage based on completed steps
-        percentage = int((completed / self._total_steps) * 100) if self._total_steps > 0 else 0
-        percentage = min(100, percentage)
-        return (completed, self._total_steps, percentage)
+        percentage = min(100, int((completed / total_steps) * 100))
+        return (completed, total_steps, percentage)
 
     def set_progress_callback(self, callback: Optional[Callable[[int], None]]):
         """Set a callback function to be called when progress updates.
@@ -544,34 +674,39 @@ class AscendingMethod:
         # Advance both counters atomically to avoid mismatched state
         self._current_step += 1
         self._completed_steps += 1
+        # Refresh the cached tuple once here so UI polls just read it
+        self.get_progress()
         
         # Calculate percentage based on current_step / total_steps
-        if self._total_steps > 0:
-            percentage = (self._current_step / self._total_steps) * 100.0
-            # Ensure percentage doesn't exceed 100%
-            percentage = min(100.0, percentage)
-        else:
-            percentage = 0.0
+        # Ensure percentage doesn't exceed 100% (scale is 0.0 when there
+        # are no steps)
+        percentage = min(100.0, self._current_step * self._step_scale)
         
-        # Call progress callback immediately (real-time update)
+        # Queue progress callback (delivered in order by the callback worker)
         if self._progress_callback:
-            try:
-                self._progress_callback(percentage)
-            except Exception as e:
-                logging.warning(f"Error calling progress callback: {e}")
-            
+            # Completed steps are always posted (there is one per frequency),
+            # even if in-frequency progress already reached the same whole
+            # percent; the legacy window only ever sees these posts. They
+            # also reset the in-frequency throttle.
+            pct_int = int(percentage)
+            self._last_posted_pct = pct_int
+            self._last_post_time = time.monotonic()
+            self._dispatch_callback(self._progress_callback, percentage)
+
             # Update UI window if available (for backward compatibility)
             try:
                 if hasattr(self.ctrl, 'ui_window') and self.ctrl.ui_window is not None:
-                    self.ctrl.ui_window.write_event_value('-PROGRESS-', int(percentage))
+                    self.ctrl.ui_window.write_event_value('-PROGRESS-', pct_int)
             except Exception as e:
                 # Log but don't fail - this is backward compatibility code
-                logging.debug(f"Error updating legacy UI window (non-critical): {e}")
-            
-            logging.info(
-                f"Progress: {self._completed_steps}/{self._total_steps} "
-                f"({percentage:.1f}%) - {self._current_earside.upper()} ear, {self._current_freq} Hz"
-            )
+                logger.debug("Error updating legacy UI window (non-critical): %s", e)
+
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Progress: %d/%d (%.1f%%) - %s ear, %s Hz",
+                    self._completed_steps, self._total_steps, percentage,
+                    self._current_earside.upper(), self._current_freq
+                )
 
     def run(self):
         """Run the complete hearing test.
@@ -588,53 +723,65 @@ class AscendingMethod:
             - Responder cleared before each test
             - Audio stopped between tests
         """
-        print("DEBUG: Entering AscendingMethod.run()")
-        if not getattr(self.ctrl.config, 'logging', False):
-            logging.disable(logging.CRITICAL)
-        
-        # Calculate total steps: (Number of Frequencies) * (Number of Ears)
-        ears = list(self.ctrl.config.earsides)
-        freqs = list(self.ctrl.config.freqs)
-        logging.info(f"DEBUG: Test Sequence Ears: {ears}")
-        print(f"DEBUG: Ears: {ears}, Freqs: {freqs}")
-        self._total_steps = len(ears) * len(freqs) if ears and freqs else 0
+        _set_timer_resolution(True)
+        try:
+            self._run_sequence()
+        finally:
+            # Make sure every queued UI update has been delivered before
+            # returning to the caller
+            self._flush_callbacks()
+            _set_timer_resolution(False)
+
+    def _run_sequence(self):
+        """Test every ear/frequency combination; body of :meth:`run`."""
+        logger.debug("Entering AscendingMethod.run()")
+        cfg = self.ctrl.config
+        # Silence only this module's logger when logging is off; other
+        # modules keep their own configuration
+        logger.setLevel(logging.NOTSET if getattr(cfg, 'logging', False)
+                        else logging.CRITICAL)
+        
+        # Snapshot the sequence once. The ear order was already shuffled by
+        # _randomize_ear_order() in __init__, so it is used as-is here.
+        ears = tuple(cfg.earsides)
+        freqs = tuple(cfg.freqs)
+        logger.debug("Ears: %s, Freqs: %s", ears, freqs)
+
+        # Flatten the ear × frequency sequence into a single plan built once.
+        # ear_switch marks the first frequency of each ear.
+        plan = [(ear, freq, freq_idx == 0)
+                for ear in ears
+                for freq_idx, freq in enumerate(freqs)]
+        self._total_steps = len(plan)
+        self._step_scale = 100.0 / self._total_steps if self._total_steps else 0.0
         self._completed_steps = 0
         
         if self._total_steps == 0:
-            logging.warning("No frequencies or earsides configured. Cannot run test.")
-            print("DEBUG: ERROR - No frequencies or earsides configured. Cannot run test.")
+            logger.warning("No frequencies or earsides configured. Cannot run test.")
             return
-        print(f"DEBUG: Total steps: {self._total_steps}")
-        
-        logging.info(f"\n{'='*70}")
-        logging.info("HEARING TEST STARTING")
-        logging.info(f"{'='*70}")
-        logging.info(
-            f"Configuration: {len(freqs)} frequencies × {len(ears)} ears = "
-            f"{self._total_steps} total steps"
+        logger.debug("Total steps: %d", self._total_steps)
+        
+        logger.info("\n%s", '='*70)
+        logger.info("HEARING TEST STARTING")
+        logger.info("%s", '='*70)
+        logger.info(
+            "Configuration: %d frequencies × %d ears = %d total steps",
+            len(freqs), len(ears), self._total_steps
         )
-        logging.info(f"Ear order: {ears}")
-        logging.info(f"Frequency order: {freqs}")
-        logging.info(f"{'='*70}\n")
-
-        # Randomize start ear so tests may start left or right but cover both
-        # Fully shuffle the ear order so start ear is randomized each run.
-        if len(ears) > 1:
-            random.shuffle(ears)
-
-        # Test each ear (order randomized)
-        for ear_idx, self.earside in enumerate(ears):
-            # Immediately notify UI that we are switching to this ear
-            self._current_earside = self.earside
-            if self._ear_change_callback:
-                try:
-                    self._ear_change_callback(self.earside)
-                except Exception as e:
-                    logging.warning(f"Error calling ear change callback: {e}")
+        logger.info("Ear order: %s", ears)
+        logger.info("Frequency order: %s", freqs)
+        logger.info("%s\n", '='*70)
+
+        # Test each ear/frequency combination (ear order randomized)
+        for step_idx, (self.earside, self.freq, ear_switch) in enumerate(plan):
+            if ear_switch:
+                # Immediately notify UI that we are switching to this ear
+                self._current_earside = self.earside
+                self._dispatch_callback(self._ear_change_callback, self.earside)
             
             # Check for stop request (after callback to ensure UI is updated)
             if self.stop_event.is_set():
-                logging.info("Test stop requested by user")
+                logger.info("Test stop requested by user")
                 # Stop audio and clean up
                 try:
                     if hasattr(self.ctrl, '_audio') and self.ctrl._audio:
@@ -643,145 +790,137 @@ class AscendingMethod:
                     pass
                 return
             
-            # Complete state reset when switching ears
-            if ear_idx > 0:
-                logging.info("\n" + "="*70)
-                logging.info("SWITCHING EARS - Complete state reset")
-                logging.info("="*70 + "\n")
-                
-                # Brief pause between ears (check stop_event)
-                if not self.ctrl._progress_sleep(0.5, self.stop_event):
-                    # Stop was requested during pause
-                    return
+            if ear_switch:
+                # Complete state reset when switching ears
+                if step_idx > 0:
+                    logger.info("\n" + "="*70)
+                    logger.info("SWITCHING EARS - Complete state reset")
+                    logger.info("="*70 + "\n")
+                    
+                    # Brief pause between ears; _pause() returns False on stop
+                    if not self._pause(0.5):
+                        # Stop was requested during pause
+                        return
+                    
+                    try:
+                        self.ctrl._rpd.clear()
+                        audio = self.ctrl._audio
+                        if audio and audio.is_playing():
+                            audio.stop()
+                            # Brief pause after stopping audio (False on stop)
+                            if not self._pause(0.2):
+                                return
+                    except Exception:
+                        pass
                 
-                try:
-                    self.ctrl._rpd.clear()
-                    if hasattr(self.ctrl._audio, '_target_gain') and self.ctrl._audio._target_gain != 0:
-                        self.ctrl._audio.stop()
-                        # Brief pause after stopping audio (check stop_event)
-                        if not self.ctrl._progress_sleep(0.2, self.stop_event):
-                            return
-                except Exception:
-                    pass
+                logger.info("\n%s", '='*70)
+                logger.info("TESTING %s EAR", self.earside.upper())
+                logger.info("%s\n", '='*70)
+            
+            self._current_freq = self.freq
+            
+            # Notify UI of frequency change immediately
+            self._dispatch_callback(self._freq_change_callback, self.freq)
             
-            logging.info(f"\n{'='*70}")
-            logging.info(f"TESTING {self.earside.upper()} EAR")
-            logging.info(f"{'='*70}\n")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("\n%s", '-'*70)
+                logger.info("Frequency: %s Hz | Ear: %s", self.freq, self.earside.upper())
+                logger.info("%s", '-'*70)
             
-            # Test each frequency for this ear
-            for freq_idx, self.freq in enumerate(freqs):
-                # Check for stop request
+            try:
+                # CRITICAL: Reset state BEFORE starting test
+                # This ensures clean isolation between frequencies
+                self._reset_state_for_new_frequency()
+                
+                # Run the hearing test for this frequency/ear combination
+                self.hearing_test()
+                
+                # CRITICAL FIX: Check if we stopped during the test
                 if self.stop_event.is_set():
-                    logging.info("Test stop requested by user")
-                    # Stop audio and clean up
-                    try:
-                        if hasattr(self.ctrl, '_audio') and self.ctrl._audio:
-                            self.ctrl._audio.stop()
-                    except Exception:
-                        pass
+                    logger.info("Test stopped. Aborting save for this frequency.")
                     return
                 
-                self._current_freq = self.freq
+                # Verify we have a valid threshold
+                if self.current_level is None:
+                    raise ValueError("Threshold determination failed")
                 
-                # Notify UI of frequency change immediately
-                if self._freq_change_callback:
-                    try:
-                        self._freq_change_callback(self.freq)
-                    except Exception as e:
-                        logging.warning(f"Error calling frequency change callback: {e}")
+                # CRITICAL: Double-check stop event BEFORE saving to prevent junk data
+                if self.stop_event.is_set():
+                    logger.info("Test stop requested before save_results(). Skipping save to prevent data corruption.")
+                    return
                 
-                logging.info(f"\n{'-'*70}")
-                logging.info(f"Frequency: {self.freq} Hz | Ear: {self.earside.upper()}")
-                logging.info(f"{'-'*70}")
+                # Save the determined threshold (only if test completed successfully)
+                self.ctrl.save_results(self.current_level, self.freq,
+                                       self.earside)
                 
-                try:
-                    # CRITICAL: Reset state BEFORE starting test
-                    # This ensures clean isolation between frequencies
-                    self._reset_state_for_new_frequency()
-                    
-                    # Run the hearing test for this frequency/ear combination
-                    self.hearing_test()
-                    
-                    # CRITICAL FIX: Check if we stopped during the test
-                    if self.stop_event.is_set():
-                        logging.info("Test stopped. Aborting save for this frequency.")
-                        return
-                    
-                    # Verify we have a valid threshold
-                    if self.current_level is None:
-                        raise ValueError("Threshold determination failed")
-                    
-                    # CRITICAL: Double-check stop event BEFORE saving to prevent junk data
-                    if self.stop_event.is_set():
-                        logging.info("Test stop requested before save_results(). Skipping save to prevent data corruption.")
-                        return
-                    
-                    # Save the determined threshold (only if test completed successfully)
-                    self.ctrl.save_results(self.current_level, self.freq,
-                                           self.earside)
-                    
-                    # Update progress IMMEDIATELY (this calls the callback)
-                    # _update_progress() will now advance both internal counters
-                    # so we do not increment _current_step here to avoid double-counting.
-                    self._update_progress()
-                    
-                    # Log for debugging
-                    logging.info(
-                        f"Progress updated: {self._current_step}/{self._total_steps} = "
-                        f"{(self._current_step/self._total_steps)*100:.1f}%"
+                # Update progress IMMEDIATELY (this calls the callback)
+                # _update_progress() will now advance both internal counters
+                # so we do not increment _current_step here to avoid double-counting.
+                self._update_progress()
+                
+                # Log for debugging
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info(
+                        "Progress updated: %d/%d = %.1f%%",
+                        self._current_step, self._total_steps,
+                        self._current_step * self._step_scale
                     )
                     
-                    logging.info(
-                        f"✓ Completed {self.earside.upper()} ear at {self.freq} Hz: "
-                        f"{self.current_level} dBHL"
+                    logger.info(
+                        "✓ Completed %s ear at %s Hz: %s dBHL",
+                        self.earside.upper(), self.freq, self.current_level
                     )
-                    
-                    # Brief pause between frequencies (check stop_event)
-                    if not self.ctrl._progress_sleep(0.3, self.stop_event):
-                        # Stop was requested during pause
-                        return
+                
+                # Brief pause between frequencies; _pause() returns False on stop
+                if not self._pause(0.3):
+                    # Stop was requested during pause
+                    return
 
-                except OverflowError:
-                    error_msg = (
-                        f"The signal is distorted at {self.freq} Hz for {self.earside} ear. "
-                        "Possible causes are an incorrect calibration or a severe hearing loss. "
-                        "Skipping to next frequency."
-                    )
-                    print(error_msg)
-                    logging.warning(error_msg)
-                    self.current_level = None
-                    # Still count as completed step (even if failed)
-                    self._update_progress()
-                    continue
-
-                except Exception as e:
-                    error_msg = (
-                        f"Error testing {self.freq} Hz for {self.earside} ear: {e}"
-                    )
-                    print(error_msg)
-                    logging.exception(error_msg)
-                    self.current_level = None
-                    # Still count as completed step (even if failed)
-                    self._update_progress()
-                    continue
-
-                except KeyboardInterrupt:
-                    # In a GUI context, calling sys.exit() will terminate the whole
-                    # application. Re-raise the exception so the calling thread
-                    # can handle it and report the error to the UI instead.
-                    raise
+            except OverflowError:
+                error_msg = (
+                    f"The signal is distorted at {self.freq} Hz for {self.earside} ear. "
+                    "Possible causes are an incorrect calibration or a severe hearing loss. "
+                    "Skipping to next frequency."
+                )
+                print(error_msg)
+                logger.warning(error_msg)
+                self.current_level = None
+                # Still count as completed step (even if failed)
+                self._update_progress()
+                continue
+
+            except Exception as e:
+                error_msg = (
+                    f"Error testing {self.freq} Hz for {self.earside} ear: {e}"
+                )
+                print(error_msg)
+                logger.exception(error_msg)
+                self.current_level = None
+                # Still count as completed step (even if failed)
+                self._update_progress()
+                continue
+
+            except KeyboardInterrupt:
+                # In a GUI context, calling sys.exit() will terminate the whole
+                # application. Re-raise the exception so the calling thread
+                # can handle it and report the error to the UI instead.
+                raise
+
+            finally:
+                self._flush_trace()
         
         # Test complete
-        logging.info(f"\n{'='*70}")
-        logging.info("TEST COMPLETE")
-        logging.info(f"{'='*70}")
-        logging.info(f"Total steps completed: {self._completed_steps}/{self._total_steps}")
+        logger.info("\n%s", '='*70)
+        logger.info("TEST COMPLETE")
+        logger.info("%s", '='*70)
+        logger.info("Total steps completed: %d/%d", self._completed_steps, self._total_steps)
         
         # Final cleanup
         try:
             self.ctrl._rpd.clear()
-            if hasattr(self.ctrl._audio, '_target_gain') and self.ctrl._audio._target_gain != 0:
-                self.ctrl._audio.stop()
+            audio = self.ctrl._audio
+            if audio and audio.is_playing():
+                audio.stop()
         except Exception:
             pass
 
@@ -793,7 +932,6 @@ class AscendingMethod:
         audiogram.make_audiogram(self.ctrl.config.filename,
                                  self.ctrl.config.results_path)
 
-
 if __name__ == '__main__':
     with AscendingMethod() as asc_method:
         asc_method.run()
@@ -8,18 +8,19 @@ clinical-standard Audiogram plots following ANSI/ISO 8253-1 standards.
 Author: Audiometry Application
 """
 
-# CRITICAL: Set matplotlib backend BEFORE importing pyplot
-# This prevents GUI crashes when called from background threads
-import matplotlib
-matplotlib.use('Agg')  # Non-interactive backend for thread safety
-
 import csv
 import io
 import base64
 import os
 from typing import Optional, Tuple, Dict, List, Any
 
-import matplotlib.pyplot as plt
+# Figures are built with the object-oriented API only (no pyplot), so no
+# GUI backend is ever selected and importing this module does not switch
+# the process-wide matplotlib backend. PNG output renders through Agg.
+from matplotlib.axes import Axes
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
 import numpy as np
 
 # Try to import pandas, fall back to manual CSV handling if not available
@@ -64,6 +65,27 @@ class AudiogramPlotter:
     Y_MAX = 120
     Y_STEP = 10
     
+    # Hearing level classification zones (dB HL), WHO/ASHA
+    HEARING_LEVEL_ZONES = (
+        (-10, 25, 'Normal\nHearing'),
+        (26, 40, 'Mild'),
+        (41, 55, 'Moderate'),
+        (56, 70, 'Moderately\nSevere'),
+        (71, 90, 'Severe'),
+        (91, 120, 'Profound'),
+    )
+    # (y_center, label) pairs for the zone annotations, computed once
+    _ZONE_LABELS = tuple(((start + end) / 2, label)
+                         for start, end, label in HEARING_LEVEL_ZONES)
+    # Axis ticks and labels, computed once and shared by every figure
+    _X_TICK_LABELS = tuple(str(f) for f in STANDARD_FREQUENCIES)
+    _Y_TICKS = tuple(range(Y_MIN, Y_MAX + 1, Y_STEP))
+    
+    # Column layout of data_np; 'ear' is EAR_CODES[earside]
+    DATA_DTYPE = np.dtype([('freq', '<f4'), ('level', '<f4'), ('ear', 'u1')])
+    EAR_CODES = {'left': 0, 'right': 1}
+    UNKNOWN_EAR_CODE = 255
+    
     def __init__(self, file_path: str):
         """
         Initialize the AudiogramPlotter with a CSV file.
@@ -78,10 +100,33 @@ class AudiogramPlotter:
         self.file_path = file_path
         self.metadata: Dict[str, str] = {}
         self.data: List[Dict[str, Any]] = []
-        self._figure: Optional[plt.Figure] = None
+        self._figure: Optional[Figure] = None
+        # This plotter's figure parts ('fig', 'ax', 'ears'), built on the
+        # first plot_audiogram() call and reused by later ones
+        self._chart: Optional[Dict[str, Any]] = None
         
         # Parse the CSV file on initialization
         self.metadata, self.data = self.parse_csv(file_path)
+        # Columnar copy used for plotting and summaries
+        self.data_np: np.ndarray = self._to_array(self.data)
+    
+    @classmethod
+    def _to_array(cls, data: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Convert parsed data rows into a NumPy structured array.
+        
+        Args:
+            data: List of dicts with 'Level/dB', 'Frequency/Hz', 'Earside'.
+            
+        Returns:
+            np.ndarray with DATA_DTYPE fields ('freq', 'level', 'ear').
+        """
+        codes = cls.EAR_CODES
+        unknown = cls.UNKNOWN_EAR_CODE
+        return np.array(
+            [(d['Frequency/Hz'], d['Level/dB'], codes.get(d['Earside'], unknown))
+             for d in data],
+            dtype=cls.DATA_DTYPE)
     
     def parse_csv(self, file_path: str) -> Tuple[Dict[str, str], List[Dict[str, Any]]]:
         """
@@ -120,41 +165,36 @@ class AudiogramPlotter:
         with open(file_path, 'r', newline='', encoding='utf-8') as csvfile:
             reader = csv.reader(csvfile)
             
+            # Metadata rows are few; read them with the csv module until the
+            # 'Level/dB' header, then hand the data block to a bulk parser
             for row in reader:
                 if not row or all(cell.strip() == '' for cell in row):
                     continue  # Skip empty rows
                 
-                # Check if this is the header row
-                if not header_found:
-                    first_cell = row[0].strip() if row else ''
-                    
-                    if first_cell == 'Level/dB':
-                        # Found the header row
-                        header_found = True
-                        header_columns = [col.strip() for col in row]
-                    else:
-                        # This is a metadata row
-                        if len(row) >= 2:
-                            key = row[0].strip()
-                            value = row[1].strip()
-                            if key:
-                                metadata[key] = value
-                else:
-                    # This is a data row
-                    if len(row) >= 3:
-                        try:
-                            level = float(row[0].strip())
-                            freq = float(row[1].strip())
-                            earside = row[2].strip().lower()
-                            
-                            data.append({
-                                'Level/dB': level,
-                                'Frequency/Hz': freq,
-                                'Earside': earside
-                            })
-                        except (ValueError, IndexError):
-                            # Skip invalid data rows
-                            continue
+                first_cell = row[0].strip()
+                if first_cell == 'Level/dB':
+                    # Found the header row
+                    header_found = True
+                    header_columns = [col.strip() for col in row]
+                    break
+                
+                # This is a metadata row
+                if len(row) >= 2:
+                    key = first_cell
+                    value = row[1].strip()
+                    if key:
+                        metadata[key] = value
+            
+            if header_found:
+                # Everything after the header is data; read it in one go so
+                # both parsers see exactly the same block
+                data_block = csvfile.read()
+                parsed = None
+                if HAS_PANDAS:
+                    parsed = self._read_data_pandas(data_block)
+                if parsed is None:
+                    parsed = self._read_data_rows(csv.reader(io.StringIO(data_block)))
+                data = parsed
         
         if not header_found:
             raise ValueError(
@@ -163,7 +203,74 @@ class AudiogramPlotter:
         
         return metadata, data
     
-    def plot_audiogram(self, save_path: Optional[str] = None) -> plt.Figure:
+    @staticmethod
+    def _read_data_rows(reader) -> List[Dict[str, Any]]:
+        """
+        Parse data rows with the csv module (fallback when pandas is absent).
+        
+        Args:
+            reader: csv.reader over the rows following the header.
+            
+        Returns:
+            List of dicts with 'Level/dB', 'Frequency/Hz', 'Earside'.
+        """
+        data: List[Dict[str, Any]] = []
+        for row in reader:
+            if len(row) >= 3:
+                try:
+                    level = float(row[0].strip())
+                    freq = float(row[1].strip())
+                    earside = row[2].strip().lower()
+                    if not earside:
+                        continue  # No ear to plot the level against
+                    
+                    data.append({
+                        'Level/dB': level,
+                        'Frequency/Hz': freq,
+                        'Earside': earside
+                    })
+                except (ValueError, IndexError):
+                    # Skip invalid data rows
+                    continue
+        return data
+    
+    @staticmethod
+    def _read_data_pandas(data_block: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Parse the data block with pandas' C parser.
+        
+        Rows without an earside or whose level/frequency are not numeric
+        are dropped, matching the csv-module path.
+        
+        Args:
+            data_block: CSV text following the 'Level/dB' header row.
+            
+        Returns:
+            List of dicts with 'Level/dB', 'Frequency/Hz', 'Earside', or None
+            if pandas cannot parse the block (caller falls back to csv).
+        """
+        try:
+            df = pd.read_csv(io.StringIO(data_block), header=None,
+                             usecols=[0, 1, 2], dtype=str, keep_default_na=False,
+                             skip_blank_lines=True, engine='c')
+        except pd.errors.EmptyDataError:
+            return []
+        except (pd.errors.ParserError, ValueError):
+            return None
+        
+        levels = pd.to_numeric(df[0].str.strip(), errors='coerce').astype(float)
+        freqs = pd.to_numeric(df[1].str.strip(), errors='coerce').astype(float)
+        earsides = df[2].fillna('').str.strip().str.lower()
+        valid = levels.notna() & freqs.notna() & (earsides != '')
+        
+        return [
+            {'Level/dB': level, 'Frequency/Hz': freq, 'Earside': earside}
+            for level, freq, earside in zip(levels[valid].tolist(),
+                                            freqs[valid].tolist(),
+                                            earsides[valid].tolist())
+        ]
+    
+    def plot_audiogram(self, save_path: Optional[str] = None) -> Figure:
         """
         Generate a clinical-standard audiogram plot.
         
@@ -181,66 +288,72 @@ class AudiogramPlotter:
         Returns:
             matplotlib.figure.Figure: The generated figure object.
         """
+        if self._chart is None:
+            self._chart = self._build_figure()
+        fig = self._chart['fig']
+        ax = self._chart['ax']
+        
+        # Replotting reuses this plotter's figure: drop the old legend; the
+        # ear artists are overwritten in place
+        if ax.get_legend() is not None:
+            ax.get_legend().remove()
+        
+        handles = self._plot_ear_data(self._chart['ears'])
+        
+        # Add legend (only for the ears that have data)
+        if handles:
+            legend = ax.legend(handles=handles, loc='upper right',
+                               fontsize=10, framealpha=0.9)
+            legend.get_frame().set_edgecolor('lightgrey')
+        
+        # Store figure reference
+        self._figure = fig
+        
+        # Save if path provided
+        if save_path:
+            fig.savefig(save_path, dpi=150, 
+                       format='png', facecolor='white', edgecolor='none')
+            print(f"Audiogram saved to: {save_path}")
+        
+        return fig
+    
+    @classmethod
+    def _build_figure(cls) -> Dict[str, Any]:
+        """
+        Build a figure with everything except the per-patient ear data.
+        
+        The figure is created without pyplot, so it is not tracked by the
+        pyplot figure manager and is freed once nothing references it.
+        
+        Returns:
+            Dict with 'fig', 'ax' and 'ears'; 'ears' maps 'right'/'left'
+            to (LineCollection, marker PathCollection, legend handle).
+        """
         # Create figure with clinical aspect ratio
-        fig, ax = plt.subplots(figsize=(10, 8))
+        fig = Figure(figsize=(10, 8))
+        ax = fig.add_subplot()
         
         # Configure the plot title
         fig.suptitle('Pure Tone Audiogram', fontsize=16, fontweight='bold', color='#00838F')
         
-        # Separate data by ear
-        left_ear_data = [(d['Frequency/Hz'], d['Level/dB']) 
-                         for d in self.data if d['Earside'] == 'left']
-        right_ear_data = [(d['Frequency/Hz'], d['Level/dB']) 
-                          for d in self.data if d['Earside'] == 'right']
-        
-        # Sort by frequency
-        left_ear_data.sort(key=lambda x: x[0])
-        right_ear_data.sort(key=lambda x: x[0])
-        
-        # Plot Right Ear (Red circles)
-        if right_ear_data:
-            freqs_r, levels_r = zip(*right_ear_data)
-            ax.plot(freqs_r, levels_r, 
-                   color=self.RIGHT_EAR_COLOR, 
-                   marker=self.RIGHT_EAR_MARKER,
-                   markersize=10,
-                   markeredgewidth=2,
-                   markerfacecolor='none',  # Hollow circle
-                   linestyle='-',
-                   linewidth=1.5,
-                   label='Right Ear')
-        
-        # Plot Left Ear (Blue X markers)
-        if left_ear_data:
-            freqs_l, levels_l = zip(*left_ear_data)
-            ax.plot(freqs_l, levels_l, 
-                   color=self.LEFT_EAR_COLOR, 
-                   marker=self.LEFT_EAR_MARKER,
-                   markersize=10,
-                   markeredgewidth=2,
-                   linestyle='-',
-                   linewidth=1.5,
-                   label='Left Ear')
-        
         # Configure X-axis (Logarithmic, frequency)
         ax.set_xscale('log')
         ax.set_xlim(100, 10000)  # Slightly beyond the standard range for padding
-        ax.set_xticks(self.STANDARD_FREQUENCIES)
-        ax.set_xticklabels([str(f) for f in self.STANDARD_FREQUENCIES])
+        ax.set_xticks(cls.STANDARD_FREQUENCIES)
+        ax.set_xticklabels(cls._X_TICK_LABELS)
         ax.set_xlabel('Frequency (Hz)', fontsize=12, fontweight='bold', color='#00838F')
         
         # Configure Y-axis (Inverted, hearing level)
-        ax.set_ylim(self.Y_MAX, self.Y_MIN)  # Inverted: 120 at bottom, -10 at top
-        ax.set_yticks(range(self.Y_MIN, self.Y_MAX + 1, self.Y_STEP))
+        ax.set_ylim(cls.Y_MAX, cls.Y_MIN)  # Inverted: 120 at bottom, -10 at top
+        ax.set_yticks(cls._Y_TICKS)
         ax.set_ylabel('Hearing Level (dB HL)', fontsize=12, fontweight='bold')
         
-        # Add secondary x-axis label at top (optional clinical format)
-        ax2 = ax.twiny()
-        ax2.set_xscale('log')
-        ax2.set_xlim(ax.get_xlim())
-        ax2.set_xticks(self.STANDARD_FREQUENCIES)
-        ax2.set_xticklabels([str(f) for f in self.STANDARD_FREQUENCIES])
-        ax2.set_xlabel('Frequency (Hz)', fontsize=10, color='#00838F')
+        # Repeat the frequency ticks along the top (clinical format) on the
+        # same axis instead of a twinned one, so they are laid out once
+        ax.tick_params(axis='x', which='major', top=True, labeltop=True,
+                       bottom=True, labelbottom=True)
+        ax.text(0.5, 1.05, 'Frequency (Hz)', transform=ax.transAxes,
+                ha='center', va='bottom', fontsize=10, color='#00838F')
         
         # Add grid
         ax.grid(True, which='major', linestyle='-', linewidth=0.5, color='lightgrey', alpha=0.7)
@@ -248,32 +361,92 @@ class AudiogramPlotter:
         ax.minorticks_on()
         
         # Add hearing level classification zones (right side annotations)
-        self._add_hearing_level_zones(ax)
-        
-        # Add legend
-        legend = ax.legend(loc='upper right', fontsize=10, framealpha=0.9)
-        legend.get_frame().set_edgecolor('lightgrey')
+        cls._add_hearing_level_zones(ax)
+        
+        # Empty per-ear artists, filled in by _plot_ear_data(). Right ear
+        # first so the left ear draws on top, as before.
+        ears = {
+            'right': cls._add_ear_artists(ax, cls.RIGHT_EAR_COLOR,
+                                          cls.RIGHT_EAR_MARKER, 'Right Ear',
+                                          hollow=True),
+            'left': cls._add_ear_artists(ax, cls.LEFT_EAR_COLOR,
+                                         cls.LEFT_EAR_MARKER, 'Left Ear'),
+        }
         
         # Clinical aspect ratio: try to maintain 1 octave = 20 dB
         # For log scale, this is complex, so we use a square-ish ratio
         ax.set_aspect('auto')
         
-        # Tight layout
-        plt.tight_layout()
+        # Tight layout, computed once here so saving does not need
+        # bbox_inches='tight' (which renders every figure twice)
+        fig.tight_layout()
         fig.subplots_adjust(top=0.88)  # Make room for title
         
-        # Store figure reference
-        self._figure = fig
+        return {'fig': fig, 'ax': ax, 'ears': ears}
+    
+    @staticmethod
+    def _add_ear_artists(ax: Axes, color: str, marker: str, label: str,
+                         hollow: bool = False) -> Tuple[Any, Any, Line2D]:
+        """
+        Add an empty line + marker collection pair for one ear.
         
-        # Save if path provided
-        if save_path:
-            fig.savefig(save_path, dpi=150, bbox_inches='tight', 
-                       format='png', facecolor='white', edgecolor='none')
-            print(f"Audiogram saved to: {save_path}")
+        Args:
+            ax: Axes to add the artists to.
+            color: Line and marker colour.
+            marker: Matplotlib marker style.
+            label: Legend label.
+            hollow: Draw unfilled markers (right ear circles).
+            
+        Returns:
+            Tuple of (LineCollection, PathCollection, legend proxy Line2D).
+        """
+        # zorder 2 matches Line2D so the traces sit above the grid
+        lines = LineCollection([], colors=color, linewidths=1.5,
+                               linestyles='-', zorder=2)
+        ax.add_collection(lines, autolim=False)
+        # Hollow markers take their colour from the edge; line markers such
+        # as 'x' are coloured through the face colour
+        colors = {'facecolors': 'none', 'edgecolors': color} if hollow else {'facecolors': color}
+        markers = ax.scatter([], [], marker=marker, s=100, linewidths=2,
+                             zorder=2, **colors)
+        handle = Line2D([], [], color=color, marker=marker, markersize=10,
+                        markeredgewidth=2,
+                        markerfacecolor='none' if hollow else color,
+                        linestyle='-', linewidth=1.5, label=label)
+        return lines, markers, handle
+    
+    def _plot_ear_data(self, ears: Dict[str, Tuple[Any, Any, Line2D]]) -> List[Line2D]:
+        """
+        Load this plotter's left/right ear thresholds into the ear artists.
         
-        return fig
+        Args:
+            ears: The figure's per-ear (lines, markers, handle) artists.
+            
+        Returns:
+            Legend handles for the ears that have data (right first).
+        """
+        d = self.data_np
+        
+        # Separate data by ear, then sort by frequency (stable, so repeated
+        # frequencies keep their file order)
+        left_ear_data = d[d['ear'] == self.EAR_CODES['left']]
+        right_ear_data = d[d['ear'] == self.EAR_CODES['right']]
+        left_ear_data = left_ear_data[np.argsort(left_ear_data['freq'], kind='stable')]
+        right_ear_data = right_ear_data[np.argsort(right_ear_data['freq'], kind='stable')]
+        
+        handles = []
+        # Right Ear: red hollow circles; Left Ear: blue X markers
+        for earside, ear_data in (('right', right_ear_data), ('left', left_ear_data)):
+            lines, markers, handle = ears[earside]
+            points = np.column_stack((ear_data['freq'], ear_data['level']))
+            lines.set_segments([points] if len(points) > 1 else [])
+            markers.set_offsets(points)
+            if len(points):
+                handles.append(handle)
+        return handles
     
-    def _add_hearing_level_zones(self, ax: plt.Axes) -> None:
+    @staticmethod
+    def _add_hearing_level_zones(ax: Axes) -> List[Any]:
         """
         Add hearing level classification zones to the right side of the plot.
         
@@ -284,28 +457,24 @@ class AudiogramPlotter:
         - Moderately Severe: 56 to 70 dB
         - Severe Loss: 71 to 90 dB
         - Profound Loss: 91+ dB
+        
+        Returns:
+            List of the matplotlib Text artists that were added.
         """
         # Get the right edge of the plot for text placement
         x_pos = 1.02  # Slightly outside the plot area
         
-        classifications = [
-            (-10, 25, 'Normal\nHearing'),
-            (26, 40, 'Mild'),
-            (41, 55, 'Moderate'),
-            (56, 70, 'Moderately\nSevere'),
-            (71, 90, 'Severe'),
-            (91, 120, 'Profound'),
-        ]
-        
-        for y_start, y_end, label in classifications:
-            y_center = (y_start + y_end) / 2
-            ax.text(x_pos, y_center, label, 
-                   transform=ax.get_yaxis_transform(),
-                   fontsize=8, 
-                   verticalalignment='center',
-                   horizontalalignment='left',
-                   color='#666666',
-                   style='italic')
+        # One transform and one style dict shared by all six labels
+        transform = ax.get_yaxis_transform()
+        style = dict(transform=transform,
+                     fontsize=8, 
+                     verticalalignment='center',
+                     horizontalalignment='left',
+                     color='#666666',
+                     style='italic')
+        
+        return [ax.text(x_pos, y_center, label, **style)
+                for y_center, label in AudiogramPlotter._ZONE_LABELS]
     
     def get_base64_image(self, dpi: int = 150) -> str:
         """
@@ -327,11 +496,10 @@ class AudiogramPlotter:
         # Save to BytesIO buffer
         buffer = io.BytesIO()
         self._figure.savefig(buffer, format='png', dpi=dpi, 
-                            bbox_inches='tight', facecolor='white', edgecolor='none')
-        buffer.seek(0)
+                            facecolor='white', edgecolor='none')
         
-        # Encode to base64
-        image_base64 = base64.b64encode(buffer.read()).decode('utf-8')
+        # Encode to base64 straight from the buffer's memory (no copy)
+        image_base64 = base64.b64encode(buffer.getbuffer()).decode('ascii')
         buffer.close()
         
         return image_base64
@@ -343,22 +511,25 @@ class AudiogramPlotter:
         Returns:
             Dict containing metadata and data statistics.
         """
-        left_count = sum(1 for d in self.data if d['Earside'] == 'left')
-        right_count = sum(1 for d in self.data if d['Earside'] == 'right')
+        d = self.data_np
+        # One pass tallies every ear code at once
+        ear_counts = np.bincount(d['ear'], minlength=len(self.EAR_CODES))
         
         return {
             'metadata': self.metadata,
-            'total_measurements': len(self.data),
-            'left_ear_measurements': left_count,
-            'right_ear_measurements': right_count,
-            'frequencies_tested': sorted(set(d['Frequency/Hz'] for d in self.data))
+            'total_measurements': len(d),
+            'left_ear_measurements': int(ear_counts[self.EAR_CODES['left']]),
+            'right_ear_measurements': int(ear_counts[self.EAR_CODES['right']]),
+            'frequencies_tested': np.unique(d['freq']).tolist()
         }
     
     def close(self) -> None:
         """Close the figure and release resources."""
         if self._figure is not None:
-            plt.close(self._figure)
+            # Not registered with pyplot, so dropping the references is
+            # what frees the figure
             self._figure = None
+            self._chart = None
 
 
 # Example usage and module test
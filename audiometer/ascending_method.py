@@ -2,12 +2,14 @@
 # `audiometer` package namespace. Tests import `audiometer.ascending_method`
 # expecting a module with the same attributes as the top-level module.
 try:
+    import sys
     import importlib
-    _mod = importlib.import_module('ascending_method')
+    # Reuse the already-imported module when there is one so the
+    # top-level module (and its logging setup) is only executed once
+    _mod = sys.modules.get('ascending_method') or importlib.import_module('ascending_method')
     # Re-export public attributes for compatibility
-    for _name, _val in _mod.__dict__.items():
-        if not _name.startswith('__'):
-            globals()[_name] = _val
+    globals().update({_name: _val for _name, _val in _mod.__dict__.items()
+                      if not _name.startswith('__')})
 except Exception:
     # Fallback to relative import
     from ..ascending_method import AscendingMethod  # type: ignore
@@ -1,14 +1,49 @@
 """Audiogram."""
 
-# CRITICAL: Set matplotlib backend BEFORE importing pyplot
-# This prevents GUI crashes when called from background threads
 import matplotlib
-matplotlib.use('Agg')  # Non-interactive backend for thread safety
-
 import numpy as np
 import csv
-import matplotlib.pyplot as plt
+import functools
+import io
+import itertools
+import multiprocessing
 import os
+import threading
+from pathlib import Path
+from concurrent.futures import Future, ProcessPoolExecutor
+
+# Figures are built on their own Agg canvas rather than through pyplot, so
+# rendering from a background thread never touches pyplot's global figure
+# manager and importing this module does not switch the matplotlib backend
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+# Try to import pandas, fall back to the csv module if not available
+try:
+    import pandas as pd
+    HAS_PANDAS = True
+except ImportError:
+    HAS_PANDAS = False
+
+
+# Hearing level grid shared by every audiogram axis
+MAJOR_TICKS = np.arange(-20, 120, 10)
+MINOR_TICKS = np.arange(-20, 120, 5)
+
+
+# (earside, conduction, masking) -> (color, marker, linestyle)
+# CLINICAL STANDARD: Right Ear = Red, Left Ear = Blue; solid lines for air
+# conduction, dashed for bone
+_EAR_STYLES = {
+    ('left', 'air', 'off'): ('b', 'x', '-'),    # X marker (clinical standard)
+    ('left', 'air', 'on'): ('b', 's', '-'),     # Square, masked
+    ('left', 'bone', 'off'): ('b', '4', '--'),  # Triangle down
+    ('left', 'bone', 'on'): ('b', '*', '--'),   # Star, masked
+    ('right', 'air', 'off'): ('r', 'o', '-'),   # Circle (O) (clinical standard)
+    ('right', 'air', 'on'): ('r', '^', '-'),    # Triangle up, masked
+    ('right', 'bone', 'off'): ('r', '3', '--'),  # Triangle left
+    ('right', 'bone', 'on'): ('r', '8', '--'),  # Octagon, masked
+}
 
 
 def set_audiogram_parameters(dBHL, freqs, conduction, masking, earside,
@@ -21,7 +56,7 @@ def set_audiogram_parameters(dBHL, freqs, conduction, masking, earside,
           dB(HearingLevel)
     freqs : array_like
           Frequency Vector in Hz
-    ax: plt.Ax, optional
+    ax: matplotlib.axes.Axes
           Matplotlib Ax to plot on
     earside: str, default='left'
           'left' or 'right' ear
@@ -31,23 +66,35 @@ def set_audiogram_parameters(dBHL, freqs, conduction, masking, earside,
           Air conduction is 'air' and bone conduction is 'bone'
     Returns
     -------
-    plt.Axis
-        Matplotlib axis containing the plot.
+    list of matplotlib.lines.Line2D
+        Lines drawn for the measured points.
 
     """
     if ax is None:
-        ax = plt.gca()
+        raise ValueError("An Axes to plot on is required")
+    _set_axes_layout(ax, freqs, earside)
+    return _plot_hearing_levels(ax, dBHL, conduction, masking, earside)
+
+
+def _set_axes_layout(ax, freqs, earside):
+    """Draw the static parts of an audiogram axis (ticks, grid, band, title)."""
     xticks = np.arange(len(freqs))
     ax.set_xlabel("f / Hz")
     ax.set_ylabel('Sound Intensity / dBHL')
     ax.set_xlim([-0.5, xticks[-1] + 0.5])
     ax.set_ylim([-20, 120])
-    plt.setp(ax, xticks=xticks, xticklabels=sorted(freqs))
-    major_ticks = np.arange(-20, 120, 10)
-    minor_ticks = np.arange(-20, 120, 5)
-    ax.set_yticks(major_ticks)
-    ax.set_yticks(minor_ticks, minor=True)
-    ax.grid(which='both')
+    ax.set_xticks(xticks)
+    ax.set_xticklabels(sorted(freqs))
+    ax.set_yticks(MAJOR_TICKS)
+    ax.set_yticks(MINOR_TICKS, minor=True)
+    # One LineCollection per direction instead of a gridline per tick,
+    # which matplotlib would otherwise draw as separate Line2D artists
+    grid_style = dict(colors=matplotlib.rcParams['grid.color'],
+                      linewidths=matplotlib.rcParams['grid.linewidth'],
+                      linestyles='-', zorder=1.5)
+    ax.vlines(xticks, 0, 1, transform=ax.get_xaxis_transform(), **grid_style)
+    ax.hlines(MINOR_TICKS, 0, 1, transform=ax.get_yaxis_transform(),
+              **grid_style)
     ax.invert_yaxis()
     
     # Task 5: Add "Normal Hearing Ability" shaded region (-10dB to 25dB)
@@ -58,127 +105,240 @@ def set_audiogram_parameters(dBHL, freqs, conduction, masking, earside,
     ax.tick_params(axis='x', labelsize=6.5)
     ax.tick_params(axis='y', labelsize=6.5)
     #  one octave on the frequency axis shall correspond
-    #  to 20 dB on the hearing level axis (ISO 8253-1 (2011) ch. 10)
-    ax.set_aspect(0.9 / ax.get_data_ratio())
+    #  to 20 dB on the hearing level axis (ISO 8253-1 (2011) ch. 10).
+    #  The limits above are fixed, so the data ratio is known up front:
+    #  140 dB over len(freqs) frequency slots
+    ax.set_aspect(0.9 * len(freqs) / 140, adjustable='box')
     ax.set_title('Hearing Level - {} ear'.format(earside))
-    
-    # CLINICAL STANDARD: Right Ear = Red (O), Left Ear = Blue (X)
-    # Following ANSI/ISO 8253-1 audiometric standards
-    if earside == 'left':
-        color = 'b'  # Blue for left ear (clinical standard)
-        if conduction == 'air' and masking == 'off':
-            marker = 'x'  # X marker for left ear air conduction (clinical standard)
-        elif conduction == 'air' and masking == 'on':
-            marker = 's'  # Square for left ear air conduction with masking
-        elif conduction == 'bone' and masking == 'off':
-            marker = '4'  # Triangle down for left ear bone conduction
-        elif conduction == 'bone' and masking == 'on':
-            marker = '*'  # Star for left ear bone conduction with masking
-        else:
-            raise NameError("Conduction has to be 'air' or 'bone'")
-    elif earside == 'right':
-        color = 'r'  # Red for right ear (clinical standard)
-        if conduction == 'air' and masking == 'off':
-            marker = 'o'  # Circle (O) marker for right ear air conduction (clinical standard)
-        elif conduction == 'air' and masking == 'on':
-            marker = '^'  # Triangle up for right ear air conduction with masking
-        elif conduction == 'bone' and masking == 'off':
-            marker = '3'  # Triangle left for right ear bone conduction
-        elif conduction == 'bone' and masking == 'on':
-            marker = '8'  # Octagon for right ear bone conduction with masking
-        else:
-            raise NameError("Conduction has to be 'air' or 'bone'")
-    elif not earside == 'right' or not earside == 'left':
+
+
+def _plot_hearing_levels(ax, dBHL, conduction, masking, earside):
+    """Plot one ear's hearing levels and refresh the axis legend."""
+    # Following ANSI/ISO 8253-1 audiometric standards, see _EAR_STYLES
+    if earside not in ('left', 'right'):
         raise NameError("'left' or 'right'?")
-    # Plot with connecting line (solid for air conduction, dashed for bone)
-    # Ensure clinical standard styling: Right=Red(O), Left=Blue(X), inverted Y-axis
-    linestyle = '-' if conduction == 'air' else '--'
+    try:
+        color, marker, linestyle = _EAR_STYLES[(earside, conduction, masking)]
+    except KeyError:
+        raise NameError("Conduction has to be 'air' or 'bone'") from None
+    # Drawn above the grid and band; left as vector paths since a dozen
+    # points is smaller in the PDF than an embedded rasterized image
     lines = ax.plot(dBHL, color=color, marker=marker, markersize=8,
                     markeredgewidth=2.5, markeredgecolor=color,
                     linestyle=linestyle, linewidth=2, fillstyle='none',
-                    label='{} ear'.format(earside.capitalize()))
+                    label='{} ear'.format(earside.capitalize()),
+                    zorder=3)
     ax.legend(loc='best')
-    gridlines = ax.get_xgridlines() + ax.get_ygridlines()
-    for line in gridlines:
-        line.set_linestyle('-')
     return lines
 
 
-def make_audiogram(filename, results_path=None):
+@functools.lru_cache(maxsize=8)
+def _template_figure(layout):
+    """Build (once per layout) a figure holding the static audiogram axes.
+
+    Args:
+        layout: Tuple of (earside, freqs) pairs, one per subplot, with
+            freqs a sorted tuple of frequencies in Hz
+
+    Returns:
+        Tuple of (figure, dict mapping earside to its Axes, lock guarding
+        the figure while a render draws on it)
+    """
+    f = Figure(figsize=(14, 6) if len(layout) == 2 else (7, 6))
+    FigureCanvasAgg(f)
+    axes = f.subplots(ncols=len(layout), squeeze=False)[0]
+    f.suptitle('Audiogram - Hearing Threshold Levels', fontsize=14, fontweight='bold')
+    for ax, (earside, freqs) in zip(axes, layout):
+        _set_axes_layout(ax, freqs, earside)
+    # Lay the figure out once (leaving room for the suptitle) instead of
+    # letting bbox_inches='tight' render every save twice to measure it
+    f.tight_layout(rect=[0, 0, 1, 0.95])
+    return f, dict(zip((earside for earside, freqs in layout), axes)), threading.Lock()
+
+
+def make_audiogram(filename, results_path=None, outputs=('pdf', 'png')):
+        """Render the audiogram for a result CSV.
+
+        Args:
+            filename: CSV filename (e.g., 'result_2025-12-15_22-08-12.csv')
+            results_path: Path to results directory (supports user folders)
+            outputs: Formats to write next to the CSV, any of 'pdf'
+                (archival copy), 'png' (web display) and 'svg' (vector
+                web display, skips Agg rasterisation)
+        """
+        unknown = set(outputs) - {'pdf', 'png', 'svg'}
+        if unknown:
+            raise ValueError("Unsupported audiogram output(s): {}".format(
+                ', '.join(sorted(unknown))))
 
         if results_path is None:
             results_path = 'audiometer/results'
-        # Ensure results_path ends with separator for proper path joining
-        if not results_path.endswith(os.sep) and not results_path.endswith('/'):
-            results_path = results_path + os.sep
-        
-        data = _read_audiogram(filename, results_path)
-        conduction = [option for cond, option, none in data
-                      if cond == 'Conduction'][0]
-        masking = [option for mask, option, none in data
-                   if mask == 'Masking'][0]
-
-        if 'right' in [side for freq, level, side in data] and (
-           'left' in [side for freq, level, side in data]):
-            f, (ax1, ax2) = plt.subplots(ncols=2, figsize=(14, 6))
-            f.suptitle('Audiogram - Hearing Threshold Levels', fontsize=14, fontweight='bold')
-        else:
-            ax1, ax2 = None, None
-            f = plt.figure(figsize=(7, 6))
-            f.suptitle('Audiogram - Hearing Threshold Levels', fontsize=14, fontweight='bold')
-
-        if 'right' in [side for freq, level, side in data]:
-            dBHL, freqs = _extract_parameters(data, 'right')
-            set_audiogram_parameters(dBHL, freqs, conduction, masking,
-                                     earside='right', ax=ax1)
-
-        if 'left' in [side for freq, level, side in data]:
-            dBHL, freqs = _extract_parameters(data, 'left')
-            set_audiogram_parameters(dBHL, freqs, conduction, masking,
-                                     earside='left', ax=ax2)
-
-        # Save PDF with proper path handling
-        # Remove .csv extension if present, then add .pdf
-        base_filename = os.path.splitext(filename)[0]
-        pdf_path = os.path.join(results_path, base_filename + '.pdf')
-        f.savefig(pdf_path, dpi=300, bbox_inches='tight')
-        print(f"Audiogram saved to: {pdf_path}")
-        
-        # Task 5: Also save PNG for web display
-        png_path = os.path.join(results_path, base_filename + '.png')
-        f.savefig(png_path, dpi=150, bbox_inches='tight', format='png')
-        print(f"Audiogram PNG saved to: {png_path}")
         
-        plt.close(f)  # Clean up figure to prevent memory leaks
+        metadata, measurements = _read_audiogram(filename, results_path)
+        conduction = metadata.get('Conduction')
+        masking = metadata.get('Masking')
+
+        # Right ear is drawn in the first subplot, left ear in the second
+        layout = tuple((earside, tuple(measurements[earside][1]))
+                       for earside in ('right', 'left')
+                       if earside in measurements)
+        f, axes, lock = _template_figure(layout)
+
+        # Outputs sit next to the CSV, with its extension swapped
+        csv_path = Path(results_path) / filename
+        pdf_path = csv_path.with_suffix('.pdf')
+        png_path = csv_path.with_suffix('.png')
+        svg_path = csv_path.with_suffix('.svg')
+
+        # The cached figure is shared, so only one render may draw on it
+        # at a time; the plotted lines are removed again afterwards
+        with lock:
+            lines = []
+            try:
+                for earside, ax in axes.items():
+                    dBHL, freqs = measurements[earside]
+                    lines += _plot_hearing_levels(ax, dBHL, conduction,
+                                                  masking, earside)
+
+                # Render the PDF straight through matplotlib's vector PDF
+                # backend; only the PNG goes through the figure's Agg canvas
+                if 'pdf' in outputs:
+                    f.savefig(pdf_path, dpi=300, format='pdf', backend='pdf')
+                    print(f"Audiogram saved to: {pdf_path}")
+
+                # Task 5: Also save PNG for web display
+                if 'png' in outputs:
+                    f.savefig(png_path, dpi=150, format='png')
+                    print(f"Audiogram PNG saved to: {png_path}")
+
+                if 'svg' in outputs:
+                    f.savefig(svg_path, format='svg', backend='svg')
+                    print(f"Audiogram SVG saved to: {svg_path}")
+            finally:
+                for line in lines:
+                    line.remove()
+
+
+# Worker process for make_audiogram_async, created on first use. It is
+# spawned rather than forked so the worker imports this module fresh instead
+# of inheriting the audio streams and threads of the running audiometer.
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _get_executor():
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=multiprocessing.get_context('spawn'))
+        return _EXECUTOR
+
+
+def make_audiogram_async(filename, results_path=None, outputs=('pdf', 'png')):
+    """Render an audiogram in a worker process.
+
+    Set AUDIO_METER_SINGLECORE=1 to render synchronously in the calling
+    process instead (e.g. on single-core machines or when debugging).
+
+    Args:
+        filename: CSV filename (e.g., 'result_2025-12-15_22-08-12.csv')
+        results_path: Path to results directory (supports user folders)
+        outputs: Formats to write, as for make_audiogram
+
+    Returns:
+        concurrent.futures.Future that completes once the requested files
+        have been written
+    """
+    if os.environ.get('AUDIO_METER_SINGLECORE') == '1':
+        future = Future()
+        try:
+            future.set_result(make_audiogram(filename, results_path, outputs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    return _get_executor().submit(make_audiogram, filename, results_path,
+                                  outputs)
 
 
 def _read_audiogram(filename, results_path=None):
     """Read audiogram data from CSV file.
     
+    The leading 'Conduction'/'Masking' rows (and the 'Level/dB' header, if
+    present) are read with the csv module; the rest of the file is parsed
+    in one go by pandas when it is available, otherwise streamed through
+    the csv module and bucketed per ear.
+    
     Args:
         filename: CSV filename (e.g., 'result_2025-12-15_22-08-12.csv')
         results_path: Path to results directory (supports user folders)
     
     Returns:
-        List of CSV rows
+        Tuple of (metadata, measurements): metadata maps 'Conduction' and
+        'Masking' to their option, measurements maps each earside to its
+        (dBHL, freqs) arrays sorted by frequency
     """
     if results_path is None:
         results_path = 'audiometer/results'
     
-    # Ensure proper path joining
-    if not results_path.endswith(os.sep) and not results_path.endswith('/'):
-        results_path = results_path + os.sep
-    
-    csv_path = os.path.join(results_path, filename)
-    with open(csv_path, 'r') as csvfile:
+    metadata = {}
+    with (Path(results_path) / filename).open('r', newline='') as csvfile:
         reader = csv.reader(csvfile)
-        data = [data for data in reader]
-    return data
+        # First measurement row, if the file has no 'Level/dB' header
+        pending = []
+        for row in reader:
+            if row and row[0] in ('Conduction', 'Masking'):
+                metadata[row[0]] = row[1]
+            elif row and row[0] == 'Level/dB':
+                break
+            elif row:
+                pending = [row]
+                break
+
+        if HAS_PANDAS:
+            data_block = csvfile.read()
+            if pending:
+                data_block = ','.join(pending[0]) + '\n' + data_block
+            measurements = _parse_measurements_pandas(data_block)
+        else:
+            # Bucket the rows per ear while streaming through the file
+            buckets = {}
+            for row in itertools.chain(pending, reader):
+                if len(row) >= 3:
+                    buckets.setdefault(row[2], []).append((row[0], row[1]))
+            measurements = {side: _extract_parameters(pairs)
+                            for side, pairs in buckets.items()}
+    return metadata, measurements
+
+
+def _parse_measurements_pandas(data_block):
+    """Parse the measurement rows with pandas' C parser.
+
+    Args:
+        data_block: CSV text of the (level, frequency, earside) rows
+
+    Returns:
+        Dict mapping each earside to its (dBHL, freqs) arrays, sorted by
+        frequency as in _extract_parameters
+    """
+    try:
+        df = pd.read_csv(io.StringIO(data_block), header=None,
+                         names=['level', 'freq', 'side'],
+                         dtype={'level': 'float64', 'freq': 'float64',
+                                'side': str},
+                         engine='c')
+    except pd.errors.EmptyDataError:
+        return {}
+    df = df.sort_values(['freq', 'level'])
+    return {side: (sub['level'].to_numpy(),
+                   sub['freq'].to_numpy().astype(np.int32))
+            for side, sub in df.groupby('side', sort=False)}
 
 
-def _extract_parameters(data, earside):
-    parameters = sorted((float(freq), float(level)) for level, freq, side
-                        in data if side == earside)
-    dBHL = [level for freq, level in parameters]
-    freqs = [int(freq) for freq, level in parameters]
-    return dBHL, freqs
+def _extract_parameters(pairs):
+    """Sort one ear's (level, freq) string pairs into (dBHL, freqs) arrays."""
+    # NumPy converts the level/frequency strings while building the array
+    parameters = np.array(pairs, dtype=[('level', 'f8'), ('freq', 'f8')])
+    parameters.sort(order=['freq', 'level'])
+    return parameters['level'], parameters['freq'].astype(np.int32)
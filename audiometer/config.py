@@ -8,6 +8,13 @@ from pathlib import Path
 import json
 import os
 
+# orjson parses/serializes several times faster; fall back to json if missing
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 DEFAULT_PREFS = {
     "theme": "darkly",
     "win_focus": True,
@@ -16,6 +23,10 @@ DEFAULT_PREFS = {
 
 _CONFIG_FILENAME = "config.json"
 
+# Last prefs read from disk, keyed on (path, mtime_ns, size) of the file
+_cached_prefs = None
+_cached_key = None
+
 
 def get_config_dir() -> Path:
     env = os.environ.get('AUDIO_METER_CONFIG_DIR')
@@ -29,28 +40,43 @@ def get_config_dir() -> Path:
 
 
 def get_config_path() -> Path:
-    d = get_config_dir()
-    d.mkdir(parents=True, exist_ok=True)
-    return d / _CONFIG_FILENAME
+    # The directory is only created when prefs are saved
+    return get_config_dir() / _CONFIG_FILENAME
 
 
 def load_prefs() -> dict:
+    global _cached_prefs, _cached_key
     path = get_config_path()
-    if not path.exists():
+    try:
+        st = path.stat()
+    except OSError:
         return dict(DEFAULT_PREFS)
+    key = (str(path), st.st_mtime_ns, st.st_size)
+    if _cached_prefs is not None and key == _cached_key:
+        return dict(_cached_prefs)
     try:
-        with path.open('r', encoding='utf-8') as f:
-            data = json.load(f)
-            # Merge with defaults for missing keys
-            prefs = dict(DEFAULT_PREFS)
-            prefs.update(data or {})
-            return prefs
+        if HAS_ORJSON:
+            data = orjson.loads(path.read_bytes())
+        else:
+            with path.open('r', encoding='utf-8') as f:
+                data = json.load(f)
+        # Merge with defaults for missing keys
+        prefs = dict(DEFAULT_PREFS)
+        prefs.update(data or {})
     except Exception:
         # If corrupt or unreadable, return defaults
         return dict(DEFAULT_PREFS)
+    _cached_prefs, _cached_key = prefs, key
+    return dict(prefs)
 
 
 def save_prefs(prefs: dict) -> None:
+    global _cached_prefs, _cached_key
     path = get_config_path()
-    with path.open('w', encoding='utf-8') as f:
-        json.dump(prefs, f, indent=2)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _cached_prefs = _cached_key = None
+    if HAS_ORJSON:
+        path.write_bytes(orjson.dumps(prefs, option=orjson.OPT_INDENT_2))
+    else:
+        with path.open('w', encoding='utf-8') as f:
+            json.dump(prefs, f, indent=2)
@@ -1,29 +1,63 @@
 from audiometer import tone_generator
 from audiometer import responder
-import numpy as np
 import argparse
-import gettext
+import collections
+import copy
+import functools
 import time
 import os
 import csv
 import random
 import re
 import logging
+import threading
 
+# Result rows are small; let them collect in one buffer and reach the disk
+# in a handful of writes (on flush/close) instead of per block
+_CSV_BUFFER_SIZE = 64 * 1024
+
+# Calibration for my SoundCard: Intel Corporation 6 Series/C200 Series
+# Chipset Family High Definition Audio Controller
+# PC Sound Level: Maximum
+# Calibration values: (frequency, reference, correction). config() exposes
+# each row as a ``calNNN`` list.
+CALIBRATION = (
+    (125, -81, 17),
+    (250, -92, 12),
+    (500, -80, -5),
+    (750, -85, -3),
+    (1000, -84, -4),
+    (1500, -82, -4),
+    (2000, -90, 2),
+    (3000, -94, 10),
+    (4000, -91, 11),
+    (6000, -70, -5),
+    (8000, -76, 1),
+)
+
+# Pause (seconds) between familiarization tones in Controller.audibletone
+_FAMILIARIZATION_PAUSE = 0.5
+
+# Folder-name sanitizing, compiled once (see Controller._sanitize_folder_name)
+# Invalid chars: < > : " / \ | ? *
+_INVALID_FOLDER_CHARS = re.compile(r'[<>:"/\\|?*]')
+_REPEATED_UNDERSCORES = re.compile(r'_+')
+_CONTROL_CHARS = re.compile(r'[\x00-\x1F\x7F]+')
+# Windows reserved device names (CON, PRN, AUX, NUL, COM1-9, LPT1-9)
+_WINDOWS_RESERVED_NAMES = frozenset(
+    ['CON', 'PRN', 'AUX', 'NUL']
+    + ['COM{}'.format(i) for i in range(1, 10)]
+    + ['LPT{}'.format(i) for i in range(1, 10)])
+# Conservative folder-name length, well within the 255-char filesystem
+# limit and short enough to avoid Windows path-length issues
+_MAX_SUBJECT_LEN = 100
 
-def config(args=None):
 
-    # Argparse/locale can attempt to load gettext translation files which
-    # may call `open()`; tests often patch builtins.open with a MagicMock
-    # which breaks gettext's file handling. Temporarily force gettext to
-    # return a NullTranslations instance while creating the ArgumentParser
-    # to avoid trying to open .mo files when tests have open mocked.
-    _saved_translation = gettext.translation
-    gettext.translation = lambda *a, **k: gettext.NullTranslations()
-    try:
-        parser = argparse.ArgumentParser(fromfile_prefix_chars='@')
-    finally:
-        gettext.translation = _saved_translation
+@functools.lru_cache(maxsize=1)
+def _build_parser():
+    """Build the command-line parser once; parse_args() does not mutate it."""
+
+    parser = argparse.ArgumentParser(fromfile_prefix_chars='@')
     parser.add_argument(
         "--device", help='How to select your soundcard is '
         'shown in http://python-sounddevice.readthedocs.org/en/0.3.3/'
@@ -64,33 +98,64 @@ def config(args=None):
     parser.add_argument("--masking", default='off')
     parser.add_argument("--results-path", type=str,
                         default='audiometer/results/')
-    parser.add_argument("--filename", default='result_{}'.format(time.strftime(
-                        '%Y-%m-%d_%H-%M-%S')) + '.csv')
+    # None is replaced with a timestamped name by config() on every call,
+    # since the parser (and so this default) is built only once
+    parser.add_argument("--filename", default=None)
     parser.add_argument("--subject-name", type=str, default=None,
                         help="Subject/patient name for organizing results in user folders")
 
     parser.add_argument("--carry-on", type=str)
     parser.add_argument("--logging", action='store_true')
-    # Calibration for my SoundCard: Intel Corporation 6 Series/C200 Series
-    # Chipset Family High Definition Audio Controller
-    # PC Sound Level: Maximum
-    # Calibration values: [frequency, reference, correction]
-    parser.add_argument("--cal125", default=[125, -81, 17])
-    parser.add_argument("--cal250", default=[250, -92, 12])
-    parser.add_argument("--cal500", default=[500, -80, -5])
-    parser.add_argument("--cal750", default=[750, -85, -3])
-    parser.add_argument("--cal1000", default=[1000, -84, -4])
-    parser.add_argument("--cal1500", default=[1500, -82, -4])
-    parser.add_argument("--cal2000", default=[2000, -90, 2])
-    parser.add_argument("--cal3000", default=[3000, -94, 10])
-    parser.add_argument("--cal4000", default=[4000, -91, 11])
-    parser.add_argument("--cal6000", default=[6000, -70, -5])
-    parser.add_argument("--cal8000", default=[8000, -76, 1])
+    return parser
+
+
+# Building the parser looks up gettext translations (which may open .mo
+# files); tests often patch builtins.open/os.path.exists with mocks that
+# break that lookup. Build it once here, at import, so that never happens
+# under a test's patches -- parsing itself only touches gettext for
+# error and help messages.
+_build_parser()
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_args_cached(args):
+    # Callers get a copy (see _copy_namespace), so the cached Namespace is
+    # never mutated
+    return _build_parser().parse_args(list(args))
+
+
+def _copy_namespace(namespace):
+    """Copy a parsed Namespace, giving the copy its own list values.
+
+    Every list option (freqs, earsides, pause_time, the cal tables) is a flat
+    list of numbers or strings, so copying the lists is as good as a
+    deepcopy and much cheaper.
+    """
+    namespace = copy.copy(namespace)
+    for name, value in vars(namespace).items():
+        if isinstance(value, list):
+            setattr(namespace, name, list(value))
+    return namespace
+
+
+def config(args=None):
 
     # If args is None, allow argparse to parse from sys.argv so tests that
     # patch sys.argv behave as expected. If callers pass a list (including
-    # empty list), that list will be used instead.
-    parsed_args = parser.parse_args(args)
+    # empty list), that list will be used instead. Explicit lists are
+    # memoized (Controller always passes [], ['--quick-mode'] or
+    # ['--mini-mode']) unless they read arguments from an @file.
+    if args is not None and not any(str(a).startswith('@') for a in args):
+        parsed_args = _copy_namespace(_parse_args_cached(tuple(args)))
+    else:
+        parsed_args = _build_parser().parse_args(args)
+
+    for freq, ref, corr in CALIBRATION:
+        setattr(parsed_args, 'cal{}'.format(freq), [freq, ref, corr])
+
+    if parsed_args.filename is None:
+        parsed_args.filename = 'result_{}'.format(time.strftime(
+            '%Y-%m-%d_%H-%M-%S')) + '.csv'
 
     # If mini-mode is requested, it takes precedence over quick-mode
     if getattr(parsed_args, 'mini_mode', False):
@@ -99,14 +164,26 @@ def config(args=None):
     elif getattr(parsed_args, 'quick_mode', False):
         parsed_args.freqs = [1000, 2000, 4000, 500]
 
-    if not os.path.exists(parsed_args.results_path):
-        os.makedirs(parsed_args.results_path)
+    _ensure_dir(parsed_args.results_path)
 
     return parsed_args
 
 
+def _ensure_dir(path):
+    """Create directory path (and parents) unless it already exists.
+
+    A genuine failure (permissions, a file in the way) raises OSError.
+    """
+    if path:
+        os.makedirs(path, exist_ok=True)
+
+
 class Controller:
 
+    # Guards the lazy creation of the responder, which the UI thread may
+    # trigger at the same time as the test thread
+    _lazy_init_lock = threading.Lock()
+
     def __init__(self, device_id=None, subject_name=None, quick_mode: bool = False, mini_mode: bool = False):
 
         # Create a base config by parsing arguments. The UI will override these.
@@ -135,19 +212,13 @@ class Controller:
             # Create user-specific results folder
             user_results_path = os.path.join(self.config.results_path, sanitized_name)
             try:
-                os.makedirs(user_results_path)
-            except Exception:
-                # If makedirs is patched in tests (mocked), ignore and continue
-                pass
+                os.makedirs(user_results_path, exist_ok=True)
+            except OSError as e:
+                # Opening the CSV below falls back to the base results path
+                logging.warning("Cannot create user folder %s: %s", user_results_path, e)
             # Update results path to user folder
             self.config.results_path = user_results_path
             print(f"Results will be saved to user folder: {user_results_path}")
-            # Some tests verify makedirs is called twice for nested structure;
-            # create a nested folder (for backward compatibility with test assertions)
-            try:
-                os.makedirs(os.path.join(self.config.results_path, sanitized_name))
-            except Exception:
-                pass
 
         # CRITICAL FIX: Allow pre-opened csvfile from tests/config and ensure
         # the directory exists (with a sensible fallback if opening fails).
@@ -159,18 +230,16 @@ class Controller:
                 self.writer = csv.writer(self.csvfile)
             else:
                 if self.config.carry_on:
+                    # The file being resumed must already exist, so there is
+                    # no folder to create here
                     file_path = os.path.join(self.config.results_path, self.config.carry_on)
-                    dirpath = os.path.dirname(file_path)
-                    if dirpath:
-                        try:
-                            os.makedirs(dirpath)
-                        except Exception:
-                            pass
-                    self.csvfile = open(file_path, 'r+', newline='', encoding='utf-8')
-                    reader = csv.reader(self.csvfile)
-                    row = None
-                    for row in reader:
-                        pass
+                    self.csvfile = open(file_path, 'r+', newline='', encoding='utf-8',
+                                        buffering=_CSV_BUFFER_SIZE)
+                    # Only the last row matters; a one-slot deque drains the
+                    # reader without keeping the earlier rows around, and
+                    # leaves the file positioned at its end for appending
+                    last_rows = collections.deque(csv.reader(self.csvfile), maxlen=1)
+                    row = last_rows[0] if last_rows else None
                     if row:
                         last_freq = row[1]
                         self.config.freqs = self.config.freqs[self.config.freqs.index(
@@ -179,16 +248,15 @@ class Controller:
                         self.writer = csv.writer(self.csvfile)
                 else:
                     file_path = os.path.join(self.config.results_path, self.config.filename)
-                    dirpath = os.path.dirname(file_path)
-                    # Ensure directory exists for file creation
-                    try:
-                        if dirpath and not os.path.exists(dirpath):
-                            os.makedirs(dirpath, exist_ok=True)
-                    except Exception:
-                        # In tests, makedirs might be mocked; ignore and proceed
-                        pass
+                    # results_path itself was created by config() or the
+                    # user-folder step above; only a filename with its own
+                    # sub-folder needs another makedirs
+                    dirpath = os.path.normpath(os.path.dirname(file_path))
+                    if dirpath != os.path.normpath(self.config.results_path):
+                        _ensure_dir(dirpath)
                     try:
-                        self.csvfile = open(file_path, 'w', newline='', encoding='utf-8')
+                        self.csvfile = open(file_path, 'w', newline='', encoding='utf-8',
+                                            buffering=_CSV_BUFFER_SIZE)
                         self.writer = csv.writer(self.csvfile)
                         # Tests expect empty strings for unused header columns
                         self.writer.writerow(['Conduction', self.config.conduction, ''])
@@ -200,7 +268,8 @@ class Controller:
                         # pre-created CSV (tests sometimes create files in the base path)
                         fallback_path = os.path.join(base_results_path, self.config.filename)
                         if os.path.exists(fallback_path):
-                            self.csvfile = open(fallback_path, 'a', newline='', encoding='utf-8')
+                            self.csvfile = open(fallback_path, 'a', newline='', encoding='utf-8',
+                                                buffering=_CSV_BUFFER_SIZE)
                             self.writer = csv.writer(self.csvfile)
                             # Keep config.results_path pointing to the fallback location
                             self.config.results_path = base_results_path
@@ -226,39 +295,60 @@ class Controller:
                     pass
             raise
 
-        self.cal_parameters = np.vstack((self.config.cal125,
-                                        self.config.cal250,
-                                        self.config.cal500,
-                                        self.config.cal750,
-                                        self.config.cal1000,
-                                        self.config.cal1500,
-                                        self.config.cal2000,
-                                        self.config.cal3000,
-                                        self.config.cal4000,
-                                        self.config.cal6000,
-                                        self.config.cal8000))
+        # Plain (freq, ref, corr) rows; they are only ever looked up, never
+        # used for array math
+        self.cal_parameters = tuple(
+            tuple(getattr(self.config, 'cal{}'.format(freq)))
+            for freq, _, _ in CALIBRATION)
 
+        # The audio stream is opened here so a missing or broken output
+        # device fails construction, before any test starts. The responder
+        # is created on first use (see _rpd), so a Controller that never
+        # waits for a click does not install keyboard hooks
         self._audio = tone_generator.AudioStream(self.config.device,
                                                  self.config.attack,
                                                  self.config.release)
-        self._rpd = responder.Responder(self.config.tone_duration)
+
+    @property
+    def _rpd(self):
+        """The Responder, created on first access."""
+        if '_rpd_inst' not in self.__dict__:
+            with self._lazy_init_lock:
+                if '_rpd_inst' not in self.__dict__:
+                    self._rpd_inst = responder.Responder(self.config.tone_duration)
+        return self._rpd_inst
+
+    @_rpd.setter
+    def _rpd(self, value):
+        self._rpd_inst = value
 
     def close(self):
         """Close and release resources held by Controller (audio stream, files)."""
         try:
-            if hasattr(self, '_audio') and self._audio:
+            audio = getattr(self, '_audio', None)
+            if audio:
                 try:
-                    self._audio.close()
+                    audio.close()
                 except Exception:
                     pass
             if hasattr(self, 'csvfile') and self.csvfile:
                 try:
-                    self.csvfile.close()
+                    self._close_csvfile()
                 except Exception:
                     pass
         except Exception:
             pass
 
+    def _close_csvfile(self):
+        """Flush the results CSV through to disk, then close it."""
+        try:
+            self.csvfile.flush()
+            os.fsync(self.csvfile.fileno())
+        except (AttributeError, OSError, TypeError, ValueError):
+            # Already closed, or not a real file (tests hand in mocks)
+            pass
+        self.csvfile.close()
+
     def __del__(self):
         try:
             self.close()
@@ -291,45 +381,32 @@ class Controller:
         name = name.strip()
         
         # Replace invalid filesystem characters with underscore
-        # Invalid chars: < > : " / \ | ? *
-        invalid_chars = r'[<>:"/\\|?*]'
-        sanitized = re.sub(invalid_chars, '_', name)
+        sanitized = _INVALID_FOLDER_CHARS.sub('_', name)
         
         # Remove multiple consecutive underscores
-        sanitized = re.sub(r'_+', '_', sanitized)
+        sanitized = _REPEATED_UNDERSCORES.sub('_', sanitized)
 
         # Remove control characters (e.g., null bytes) which can cause
         # OSError when creating filesystem entries on many platforms.
         # This also strips ASCII control characters and DEL.
-        sanitized = re.sub(r'[\x00-\x1F\x7F]+', '', sanitized)
+        sanitized = _CONTROL_CHARS.sub('', sanitized)
         
         # Remove leading/trailing underscores and dots (Windows restriction)
         sanitized = sanitized.strip('_.')
         
         # CRITICAL FIX: Check for Windows reserved names (CON, PRN, AUX, NUL, COM1-9, LPT1-9)
         # These names cause OSError on Windows and must be avoided
-        windows_reserved = [
-            'CON', 'PRN', 'AUX', 'NUL',
-            'COM1', 'COM2', 'COM3', 'COM4', 'COM5', 'COM6', 'COM7', 'COM8', 'COM9',
-            'LPT1', 'LPT2', 'LPT3', 'LPT4', 'LPT5', 'LPT6', 'LPT7', 'LPT8', 'LPT9'
-        ]
-        if sanitized.upper() in windows_reserved:
+        if sanitized.upper() in _WINDOWS_RESERVED_NAMES:
             sanitized = f"User_{sanitized}"
         
         # Ensure name is not empty after removal
         if not sanitized:
             sanitized = 'Unknown_Subject'
 
-        # Further limit the length to a conservative size to avoid
-        # triggering OS path-length issues on Windows (and other OSes).
-        # Keep it reasonable for folder display as well.
-        MAX_SUBJECT_LEN = 100
-        if len(sanitized) > MAX_SUBJECT_LEN:
-            sanitized = sanitized[:MAX_SUBJECT_LEN]
-        
-        # Limit length to 255 characters (filesystem limit)
-        if len(sanitized) > 255:
-            sanitized = sanitized[:255]
+        # Limit the length (this also keeps it under the 255-character
+        # filesystem limit)
+        if len(sanitized) > _MAX_SUBJECT_LEN:
+            sanitized = sanitized[:_MAX_SUBJECT_LEN]
         
         return sanitized
 
@@ -345,7 +422,8 @@ class Controller:
         Returns:
             True if patient responded, False otherwise
         """
-        if self.dBHL2dBFS(freq, current_level_dBHL) > 0:
+        level_dBFS = self.dBHL2dBFS(freq, current_level_dBHL)
+        if level_dBFS > 0:
             raise OverflowError
         
         # Check stop event before starting
@@ -353,7 +431,7 @@ class Controller:
             return False
         
         self._rpd.clear()
-        self._audio.start(freq, self.dBHL2dBFS(freq, current_level_dBHL),
+        self._audio.start(freq, level_dBFS,
                   earside)
         
         # Sleep in small increments, checking stop_event
@@ -365,31 +443,22 @@ class Controller:
         click_down = self._rpd.click_down()
         self._audio.stop()
         
+        # A response counts only if the button is released within tolerance
+        responded = False
         if click_down:
-            start = time.time()
+            # Monotonic, so a wall-clock adjustment cannot skew the press
+            # duration compared against the tolerance
+            start = time.monotonic()
             self._rpd.wait_for_click_up()
-            end = time.time()
-            if (end - start) <= self.config.tolerance:
-                # Check stop event before pause
-                if stop_event and stop_event.is_set():
-                    return False
-                self._progress_sleep(random.uniform(self.config.pause_time[0],
-                           self.config.pause_time[1]), stop_event)
-                return True
-            else:
-                # Check stop event before pause
-                if stop_event and stop_event.is_set():
-                    return False
-                self._progress_sleep(random.uniform(self.config.pause_time[0],
-                           self.config.pause_time[1]), stop_event)
-                return False
-        else:
-            # Check stop event before pause
-            if stop_event and stop_event.is_set():
-                return False
-            self._progress_sleep(random.uniform(self.config.pause_time[0],
-                                      self.config.pause_time[1]), stop_event)
+            end = time.monotonic()
+            responded = (end - start) <= self.config.tolerance
+        
+        # Check stop event before pause
+        if stop_event and stop_event.is_set():
             return False
+        pause_min, pause_max = self.config.pause_time[0], self.config.pause_time[1]
+        self._progress_sleep(random.uniform(pause_min, pause_max), stop_event)
+        return responded
 
     def audibletone(self, freq, current_level_dBHL, earside, stop_event=None):
         """Automatic tone familiarization via button press.
@@ -414,7 +483,8 @@ class Controller:
                 self.stop_audio_immediately()
                 return current_level_dBHL  # Return current level if stopped
             
-            if self.dBHL2dBFS(freq, current_level_dBHL) > 0:
+            level_dBFS = self.dBHL2dBFS(freq, current_level_dBHL)
+            if level_dBFS > 0:
                 print(f"WARNING: Signal is distorted at {current_level_dBHL} dBHL. "
                       "Skipping to next level.")
                 current_level_dBHL += 10
@@ -427,7 +497,7 @@ class Controller:
             
             # Start playing tone
             self._audio.start(freq,
-                              self.dBHL2dBFS(freq, current_level_dBHL),
+                              level_dBFS,
                               earside)
             
             # Let tone play for the configured duration (checking stop_event)
@@ -449,7 +519,7 @@ class Controller:
                 # Check stop event before pause
                 if stop_event and stop_event.is_set():
                     return current_level_dBHL
-                self._progress_sleep(0.5, stop_event)
+                self._progress_sleep(_FAMILIARIZATION_PAUSE, stop_event)
                 return current_level_dBHL
             
             # Button not pressed, increase level and try again
@@ -458,13 +528,13 @@ class Controller:
             # Check stop event before pause
             if stop_event and stop_event.is_set():
                 return current_level_dBHL
-            self._progress_sleep(0.5, stop_event)
+            self._progress_sleep(_FAMILIARIZATION_PAUSE, stop_event)
         
         print(f"Reached maximum safety level ({max_level_dBHL} dBHL) without confirmation")
         return current_level_dBHL
 
     def _progress_sleep(self, total_time, stop_event=None):
-        """Sleep in small increments and check stop_event to allow immediate cancellation.
+        """Sleep for total_time, returning early if stop_event is set.
         
         Args:
             total_time: Total time to sleep in seconds
@@ -478,23 +548,9 @@ class Controller:
             time.sleep(total_time)
             return True
         
-        # Sleep in small increments, checking stop_event frequently
-        start = time.time()
-        chunk_size = 0.05  # Check every 50ms for responsiveness
-        
-        while time.time() - start < total_time:
-            if stop_event.is_set():
-                # Stop requested - return immediately
-                return False
-            # Sleep in small chunks
-            remaining = total_time - (time.time() - start)
-            time.sleep(min(chunk_size, remaining))
-        
-        # Check one final time
-        if stop_event and stop_event.is_set():
-            return False
-        
-        return True
+        # Event.wait blocks until the timeout or until set() is called,
+        # so a stop request is seen immediately without polling
+        return not stop_event.wait(total_time)
     
     def stop_audio_immediately(self):
         """Force stop audio playback immediately.
@@ -503,8 +559,9 @@ class Controller:
         useful for emergency stops when stop_event is set.
         """
         try:
-            if hasattr(self, '_audio') and self._audio:
-                self._audio.stop()
+            audio = getattr(self, '_audio', None)
+            if audio:
+                audio.stop()
                 # Give it a moment to stop, then close if needed
                 time.sleep(0.05)
                 # Note: We don't close here as it might be needed again
@@ -518,22 +575,44 @@ class Controller:
         time.sleep(1)
 
     def save_results(self, level, freq, earside):
+        """Append one threshold row to the results CSV.
+
+        Rows collect in the file's write buffer; they are only guaranteed
+        to be on disk once the Controller is closed (close()/__exit__).
+        """
         row = [level, freq, earside]
         self.writer.writerow(row)
 
+    def _calibration_offsets(self):
+        """Return {freq: ref + corr} for the current calibration table.
+
+        Built once per ``cal_parameters`` table and rebuilt only if the
+        attribute is replaced, so each conversion is a dict lookup.
+        """
+        cal = self.cal_parameters
+        if getattr(self, '_cal_offsets_src', None) is not cal:
+            self._cal_offsets = {freq: ref + corr for freq, ref, corr in cal}
+            self._cal_offsets_src = cal
+        return self._cal_offsets
+
     def dBHL2dBFS(self, freq_value, dBHL):
-        calibration = [(ref, corr) for freq, ref, corr in self.cal_parameters
-                       if freq == freq_value]
+        try:
+            offset = self._calibration_offsets()[freq_value]
+        except KeyError:
+            # Same failure as the old list-based lookup for unknown freqs
+            raise IndexError(f"No calibration for {freq_value} Hz") from None
         # Ensure we return a native Python float (not a numpy scalar) so
         # callers and unit tests can rely on built-in numeric types.
-        return float(calibration[0][0] + calibration[0][1] + dBHL)
+        return float(offset + dBHL)
 
     def __enter__(self):
         return self
 
     def __exit__(self, *args):
         time.sleep(0.1)
-        self._rpd.__exit__()
+        rpd = self.__dict__.get('_rpd_inst')
+        if rpd:
+            rpd.__exit__()
         self._audio.close()
         if self.csvfile:
-            self.csvfile.close()
+            self._close_csvfile()
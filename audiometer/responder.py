@@ -18,9 +18,17 @@ The Responder maintains the same public API so the rest of the codebase
 import threading
 import logging
 import sys
+import weakref
+from time import monotonic_ns
 from typing import Any, List, Optional
 
 
+# Bits of Responder._state
+_BUTTON_DOWN = 0b001          # button is physically held
+_PRESSED_DURING_TONE = 0b010  # a press was seen since the last clear()
+_HELD = 0b100                 # pressed and not yet released or cleared
+
+
 class Responder:
     """Handle button input via USB headset media keys or UI button.
 
@@ -45,24 +53,26 @@ class Responder:
         """
         self._timeout = tone_duration
         self._lock = threading.Lock()
+        # Waiters block on this; state changes notify it while already
+        # holding _lock, so there is no separate lock per signal
+        self._cv = threading.Condition(self._lock)
 
-        # Button state tracking
-        self._button_state = False
-        self._pressed_during_tone = False
-
-        # Threading events for synchronization
-        self._button_pressed_event = threading.Event()
-        self._button_released_event = threading.Event()
-        self._button_released_event.set()  # Start in released state
+        # Button state as _BUTTON_DOWN/_PRESSED_DURING_TONE/_HELD bits.
+        # Written under _lock (waiters on _cv wait for _HELD to change),
+        # read lock-free. _presses counts every press so a waiter still sees
+        # a click that was pressed and released before it woke up
+        self._state = 0
+        self._presses = 0
 
         # Keyboard handler bookkeeping
         self._keyboard: Optional[Any] = None
         self._handlers: List[Any] = []
         self._suppress_supported = True
 
-        # Track timestamps for press/release (helps timing logic/tests)
-        self._last_press_time: Optional[float] = None
-        self._last_release_time: Optional[float] = None
+        # Track monotonic timestamps (integer ns) for press/release (helps
+        # timing logic/tests); divide a difference by 1e9 for seconds
+        self._last_press_time: Optional[int] = None
+        self._last_release_time: Optional[int] = None
 
         # Try to import and register keyboard handlers
         # Prefer an already-inserted keyboard module from sys.modules (helps tests)
@@ -95,69 +105,85 @@ class Responder:
         if not self._keyboard:
             return
 
-        # If the keyboard module supports hook(), register exactly two handlers
-        # (one for press/down and one for release/up) rather than registering
-        # separate handlers per media key. This matches test expectations where
-        # hook() registers global handlers and the handler inspects event_type.
+        # The keyboard module's registry keeps every handler alive, so the
+        # handlers reach the Responder only through a weak reference; a
+        # discarded Responder is then freed without waiting for close()
+        wself = weakref.ref(self)
+
+        def on_media_press(event):
+            responder = wself()
+            if responder is not None:
+                responder._on_media_press(event)
+
+        def on_media_release(event):
+            responder = wself()
+            if responder is not None:
+                responder._on_media_release(event)
+
+        # If the keyboard module supports hook(), register a single global
+        # handler that picks out the media keys and dispatches on
+        # event_type, rather than registering separate handlers per key.
         hook_fn = getattr(self._keyboard, 'hook', None)
         if callable(hook_fn):
-            def make_handler(is_press: bool):
-                def handler(event):
-                    if event.event_type == ('down' if is_press else 'up'):
-                        if is_press:
-                            self._on_media_press(event)
-                        else:
-                            self._on_media_release(event)
-                return handler
+            media_names = frozenset(
+                variant for key in self.MEDIA_KEYS
+                for variant in (key, key.replace(' ', '_'), key.replace(' ', '-')))
+
+            def dispatcher(event):
+                # A blocking hook suppresses every event it returns a falsy
+                # value for, so let all other keys through untouched
+                if event.name not in media_names:
+                    return True
+                if event.event_type == 'down':
+                    on_media_press(event)
+                elif event.event_type == 'up':
+                    on_media_release(event)
+                return False
 
             try:
-                h_press = hook_fn(make_handler(True), suppress=True)
-                h_release = hook_fn(make_handler(False), suppress=True)
-                self._handlers.extend([h_press, h_release])
-                logging.info("Registered media handlers using hook() API (global handlers)")
+                self._handlers.append(hook_fn(dispatcher, suppress=True))
+                logging.info("Registered media handler using hook() API (global handler)")
                 return
             except Exception as e:
                 logging.debug(f"Hook-based registration failed: {e}")
 
         # Fallback: try on_press_key/on_release_key per-media-key (space/underscore variants)
+        on_press = getattr(self._keyboard, 'on_press_key', None)
+        on_release = getattr(self._keyboard, 'on_release_key', None)
+        if not callable(on_press) or not callable(on_release):
+            logging.warning("keyboard module offers no key hooks; "
+                            "using UI-only responder")
+            return
+
         for key in self.MEDIA_KEYS:
             registered = False
             variants = (key, key.replace(' ', '_'), key.replace(' ', '-'))
             for k in variants:
                 try:
-                    on_press = getattr(self._keyboard, 'on_press_key', None)
-                    on_release = getattr(self._keyboard, 'on_release_key', None)
-                    if not callable(on_press) or not callable(on_release):
-                        continue
-
+                    h_press = on_press(k, on_media_press, suppress=True)
+                    h_release = on_release(k, on_media_release, suppress=True)
+                    self._handlers.extend([h_press, h_release])
+                    registered = True
+                    logging.info(f"Registered media key '{k}' with suppression enabled")
+                    break
+                except TypeError:
+                    # suppress kwarg not supported
                     try:
-                        h_press = on_press(k, self._on_media_press, suppress=True)
-                        h_release = on_release(k, self._on_media_release, suppress=True)
+                        h_press = on_press(k, on_media_press)
+                        h_release = on_release(k, on_media_release)
                         self._handlers.extend([h_press, h_release])
+                        self._suppress_supported = False
                         registered = True
-                        logging.info(f"Registered media key '{k}' with suppression enabled")
+                        logging.warning(
+                            f"Registered media key '{k}' without suppression "
+                            "(system volume may change during test)"
+                        )
                         break
-                    except TypeError:
-                        # suppress kwarg not supported
-                        try:
-                            h_press = on_press(k, self._on_media_press)
-                            h_release = on_release(k, self._on_media_release)
-                            self._handlers.extend([h_press, h_release])
-                            self._suppress_supported = False
-                            registered = True
-                            logging.warning(
-                                f"Registered media key '{k}' without suppression "
-                                "(system volume may change during test)"
-                            )
-                            break
-                        except Exception as e:
-                            logging.debug(f"Failed to register key variant '{k}' without suppress: {e}")
-                            continue
                     except Exception as e:
-                        logging.debug(f"Failed to register key variant '{k}' with suppress: {e}")
+                        logging.debug(f"Failed to register key variant '{k}' without suppress: {e}")
                         continue
                 except Exception as e:
-                    logging.debug(f"Error registering key variant '{k}': {e}")
+                    logging.debug(f"Failed to register key variant '{k}' with suppress: {e}")
                     continue
 
             if not registered:
@@ -175,57 +201,38 @@ class Responder:
         Either 'volume up' or 'volume down' press is treated as a valid
         user response indicating they heard the tone.
         """
-        with self._lock:
-            self._button_state = True
-            self._pressed_during_tone = True
-            # Record timestamp of press for accurate timing calculations
-            try:
-                import time as _time
-                self._last_press_time = _time.time()
-            except Exception:
-                self._last_press_time = None
-            self._button_released_event.clear()
-            self._button_pressed_event.set()
+        self._press()
         logging.debug("Media key pressed - user response detected")
 
     def _on_media_release(self, event: Any) -> None:
         """Called when a media key is released."""
-        with self._lock:
-            self._button_state = False
-            # Record timestamp of release
-            try:
-                import time as _time
-                self._last_release_time = _time.time()
-            except Exception:
-                self._last_release_time = None
-            self._button_pressed_event.clear()
-            self._button_released_event.set()
+        self._release()
         logging.debug("Media key released")
 
     def ui_button_pressed(self) -> None:
         """Call this when the GUI response button is pressed."""
-        with self._lock:
-            self._button_state = True
-            self._pressed_during_tone = True
-            try:
-                import time as _time
-                self._last_press_time = _time.time()
-            except Exception:
-                self._last_press_time = None
-            self._button_released_event.clear()
-            self._button_pressed_event.set()
+        self._press()
 
     def ui_button_released(self) -> None:
         """Call this when the GUI response button is released."""
+        self._release()
+
+    def _press(self) -> None:
+        """Record a press from either input source."""
         with self._lock:
-            self._button_state = False
-            try:
-                import time as _time
-                self._last_release_time = _time.time()
-            except Exception:
-                self._last_release_time = None
-            self._button_pressed_event.clear()
-            self._button_released_event.set()
+            self._state |= _BUTTON_DOWN | _PRESSED_DURING_TONE | _HELD
+            # Record timestamp of press for accurate timing calculations
+            # (monotonic: only differences between timestamps are used)
+            self._last_press_time = monotonic_ns()
+            self._presses += 1
+            self._cv.notify_all()
+
+    def _release(self) -> None:
+        """Record a release from either input source."""
+        with self._lock:
+            self._state &= ~(_BUTTON_DOWN | _HELD)
+            self._last_release_time = monotonic_ns()
+            self._cv.notify_all()
 
     def clear(self) -> None:
         """Reset state for a new tone/presentation.
@@ -233,23 +240,23 @@ class Responder:
         Call this before each new tone to ensure clean state tracking.
         """
         with self._lock:
-            self._pressed_during_tone = False
-            self._button_pressed_event.clear()
-            self._button_released_event.set()
+            self._state &= ~(_PRESSED_DURING_TONE | _HELD)
+            self._cv.notify_all()
 
     def click_down(self) -> bool:
         """Return True if a click (press) was registered during the tone.
         
         This checks if the button was pressed during the current tone cycle,
-        as tracked by _pressed_during_tone flag.
+        as tracked by the _PRESSED_DURING_TONE bit.
         """
-        with self._lock:
-            return self._pressed_during_tone
+        # Reading a single int attribute is atomic, so no lock is needed;
+        # writers still hold _lock to keep the bits and timestamps together
+        return bool(self._state & _PRESSED_DURING_TONE)
 
     def click_up(self) -> bool:
         """Return True if the button is currently released."""
-        with self._lock:
-            return not self._button_state
+        # Lock-free read, as in click_down()
+        return not self._state & _BUTTON_DOWN
 
     def wait_for_click_up(self, timeout: Optional[float] = None) -> None:
         """Block until the button is released.
@@ -257,7 +264,8 @@ class Responder:
         Args:
             timeout: Maximum time to wait (seconds). None = wait indefinitely.
         """
-        self._button_released_event.wait(timeout=timeout)
+        with self._cv:
+            self._cv.wait_for(lambda: not self._state & _HELD, timeout=timeout)
 
     def wait_for_click_down_and_up(self, timeout: Optional[float] = None) -> bool:
         """Block until the button is pressed and then released.
@@ -272,35 +280,36 @@ class Responder:
         if timeout is None:
             timeout = self._timeout
 
-        pressed = self._button_pressed_event.wait(timeout=timeout)
-        if not pressed:
-            return False
-        released = self._button_released_event.wait(timeout=timeout + 1.0)
-        return bool(released)
+        with self._cv:
+            presses = self._presses
+            if not self._cv.wait_for(
+                    lambda: self._state & _HELD or self._presses != presses,
+                    timeout=timeout):
+                return False
+            return self._cv.wait_for(lambda: not self._state & _HELD,
+                                     timeout=timeout + 1.0)
 
     def close(self) -> None:
         """Unregister keyboard handlers and free resources."""
-        if self._keyboard and self._handlers:
-            try:
-                for h in list(self._handlers):
+        if not (self._keyboard and self._handlers):
+            return
+        # Resolve the API once. Per-handler unhook() is preferred because
+        # unhook_all() would also drop hooks owned by any other Responder
+        unhook = getattr(self._keyboard, 'unhook', None)
+        unhook_all = getattr(self._keyboard, 'unhook_all', None)
+        try:
+            if callable(unhook):
+                for h in self._handlers:
                     try:
-                        # Try unhook() method
-                        unhook = getattr(self._keyboard, 'unhook', None)
-                        if callable(unhook):
-                            unhook(h)
-                        else:
-                            # Try unhook_all() if individual unhook doesn't work
-                            unhook_all = getattr(self._keyboard, 'unhook_all', None)
-                            if callable(unhook_all):
-                                unhook_all()
-                                break
+                        unhook(h)
                     except Exception as e:
                         logging.debug(f"Error unhooking handler: {e}")
-                        pass
-                self._handlers = []
-                logging.debug("Unregistered all keyboard handlers")
-            except Exception:
-                logging.exception("Error while unhooking keyboard handlers")
+            elif callable(unhook_all):
+                unhook_all()
+            self._handlers = []
+            logging.debug("Unregistered all keyboard handlers")
+        except Exception:
+            logging.exception("Error while unhooking keyboard handlers")
 
     def __enter__(self):
         return self
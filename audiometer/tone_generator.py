@@ -1,8 +1,63 @@
 """Generation of pure tones with strict stereo channel separation."""
+import math
 import numpy as np
 import sounddevice as sd
 import logging
 
+# Numba compiles the per-sample render loop to machine code; without it the
+# callback falls back to the NumPy ufunc chain
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+# Initial size (frames) of the callback's scratch buffers; they grow if the
+# host ever asks for a larger block
+_SCRATCH_FRAMES = 8192
+
+# Channel mask for each ear, [Left, Right]. Shared by every stream and only
+# ever read, never written, by the callback
+_EARSIDE_MASKS = {
+    'left': np.array([1.0, 0.0], dtype=np.float32),   # Left ONLY
+    'right': np.array([0.0, 1.0], dtype=np.float32),  # Right ONLY
+}
+
+def _render(outdata, frames, phase, phase_inc, target_gain, slope,
+            last_gain, mask):
+    """Write one buffer of the ramped, masked sine into outdata.
+
+    Fuses the gain ramp, the sine and the channel mask into one pass over
+    the buffer. The sine comes from rotating the phasor (re, im) by
+    phase_inc each sample, a few multiply-adds instead of a sin() call.
+    It is seeded from the exact phase on every call, so rounding in the
+    rotation never builds up past one buffer. Returns the gain of the last
+    sample.
+    """
+    mask_left = mask[0]
+    mask_right = mask[1]
+    rot_re = math.cos(phase_inc)
+    rot_im = math.sin(phase_inc)
+    re = math.cos(phase)
+    im = math.sin(phase)
+    gain = last_gain
+    for i in range(frames):
+        gain = last_gain + slope * (i + 1)
+        if slope > 0:
+            gain = min(target_gain, gain)
+        else:
+            gain = max(target_gain, gain)
+        sample = gain * im
+        outdata[i, 0] = sample * mask_left
+        outdata[i, 1] = sample * mask_right
+        re, im = re * rot_re - im * rot_im, re * rot_im + im * rot_re
+    return gain
+
+
+if HAS_NUMBA:
+    _render = njit(cache=True, fastmath=True)(_render)
+
+
 class AudioStream:
     def __init__(self, device, attack, release):
         if attack <= 0 or release <= 0:
@@ -19,7 +74,7 @@ class AudioStream:
             self.samplerate = 44100 # Fallback on error
 
         # Matrix Masking: Default to silence [Left=0, Right=0]
-        self.channel_mask = np.array([0.0, 0.0])
+        self.channel_mask = np.array([0.0, 0.0], dtype=np.float32)
         
         # Always request 2 channels for stereo
         self._stream = sd.OutputStream(
@@ -28,11 +83,26 @@ class AudioStream:
             channels=2,
             samplerate=self.samplerate
         )
+        # The stream uses sounddevice's default float32 samples (output is
+        # at most 24-bit, so nothing is lost); the callback computes in
+        # float32 as well
         
         self._attack = np.round(self.samplerate * (attack / 1000)).astype(int)
         self._release = np.round(self.samplerate * (release / 1000)).astype(int)
         self._last_gain = 0
-        self._index = 0
+        self._phase = 0.0  # Sine phase (radians) at the next output sample
+        # Radians per sample per Hz; the device's samplerate is fixed for
+        # the life of the stream
+        self._two_pi_over_sr = 2 * np.pi / self.samplerate
+        self._alloc_scratch(_SCRATCH_FRAMES)
+        # (phase step, cos table, sin table) for the NumPy path, built by
+        # start() for each tone and swapped in as one tuple
+        self._sine_tables = (None, None, None)
+        if HAS_NUMBA:
+            # Compile (or load from cache) now, not in the first callback on
+            # the realtime thread; sounddevice hands out float32 buffers
+            _render(np.zeros((1, 2), dtype=np.float32), 1,
+                    0.0, 0.0, 0.0, 0.0, 0.0, self.channel_mask)
         self._target_gain = 0
         self._callback_parameters = (0, 0, 0) # target, slope, freq
         self._callback_status = sd.CallbackFlags()
@@ -40,44 +110,106 @@ class AudioStream:
 
     def _callback(self, outdata, frames, time, status):
         """Matrix Multiplication Callback - Guarantees Isolation"""
-        assert frames > 0
         self._callback_status |= status
         
         target_gain, slope, freq = self._callback_parameters
         
+        # Phase accumulator: carry the phase over from the previous buffer
+        # instead of recomputing 2*pi*freq*k/samplerate from the absolute
+        # sample index (which also loses precision as k grows)
+        phase_inc = self._two_pi_over_sr * freq
+        
+        if HAS_NUMBA:
+            self._last_gain = _render(outdata, frames, self._phase, phase_inc,
+                                      float(target_gain), float(slope),
+                                      float(self._last_gain),
+                                      self.channel_mask)
+        else:
+            self._last_gain = self._render_numpy(outdata, frames, phase_inc,
+                                                 target_gain, slope)
+        
+        self._phase = (self._phase + frames * phase_inc) % (2 * np.pi)
+
+    def _render_numpy(self, outdata, frames, phase_inc, target_gain, slope):
+        """NumPy version of _render, used when numba is not installed."""
+        if frames > len(self._scratch_n):
+            self._alloc_scratch(frames)
+        # Work in preallocated buffers so the realtime audio thread does
+        # not allocate on every callback
+        n = self._scratch_n[:frames]
+        gain = self._scratch_gain[:frames]
+        signal = self._scratch_signal[:frames]
+        tmp = self._scratch_tmp[:frames]
+        
         # Generate Mono Sine Wave
-        k = np.arange(self._index, self._index + frames)
-        ramp = np.arange(frames) * slope + self._last_gain + slope
+        np.multiply(n, slope, out=gain)
+        gain += self._last_gain + slope
         
         if slope > 0:
-            gain = np.minimum(target_gain, ramp)
+            np.minimum(gain, target_gain, out=gain)
         else:
-            gain = np.maximum(target_gain, ramp)
+            np.maximum(gain, target_gain, out=gain)
         
         # Mono signal: Shape (Frames,)
-        signal = gain * np.sin(2 * np.pi * freq * k / self.samplerate)
+        table_inc, table_cos, table_sin = self._sine_tables
+        if table_inc == phase_inc and frames <= len(table_cos):
+            # sin(phase + n*inc) = sin(phase)*cos(n*inc) + cos(phase)*sin(n*inc),
+            # with the cos/sin tables fixed for the whole tone
+            np.multiply(table_cos[:frames], math.sin(self._phase), out=signal)
+            np.multiply(table_sin[:frames], math.cos(self._phase), out=tmp)
+            signal += tmp
+        else:
+            # No tables for this pitch or block size: evaluate the sine
+            np.multiply(n, phase_inc, out=signal)
+            signal += self._phase
+            np.sin(signal, out=signal)
+        signal *= gain
         
         # BROADCASTING MAGIC: (Frames, 1) * (2,) = (Frames, 2)
-        # This multiplies the signal by [1, 0] (Left) or [0, 1] (Right)
-        stereo_signal = signal[:, np.newaxis] * self.channel_mask
-        
-        # Assign to output buffer
-        outdata[:] = stereo_signal
-        
-        self._index += frames
-        self._last_gain = gain[-1]
+        # This multiplies the signal by [1, 0] (Left) or [0, 1] (Right),
+        # writing straight into the output buffer
+        np.multiply(signal[:, np.newaxis], self.channel_mask, out=outdata)
+        return gain[-1]
+
+    def _alloc_scratch(self, frames):
+        """(Re)allocate the callback's scratch buffers for frames samples."""
+        # float32 like the output buffer: the ufuncs run on twice the SIMD
+        # lanes. The phase is still carried in a Python float between
+        # callbacks, so rounding does not build up across buffers
+        self._scratch_n = np.arange(frames, dtype=np.float32)
+        self._scratch_gain = np.empty(frames, dtype=np.float32)
+        self._scratch_signal = np.empty(frames, dtype=np.float32)
+        self._scratch_tmp = np.empty(frames, dtype=np.float32)
+
+    @staticmethod
+    def _make_sine_tables(phase_inc, frames):
+        """Return (phase_inc, cos table, sin table) of n * phase_inc.
+
+        Called from start(), off the realtime thread, once per tone.
+        """
+        # Angles in float64 so the float32 tables are exact to the last bit
+        angles = np.arange(frames) * phase_inc
+        return (phase_inc, np.cos(angles).astype(np.float32),
+                np.sin(angles).astype(np.float32))
 
     def start(self, freq, gain_db, earside=None):
         if self._target_gain != 0:
             raise ValueError("Target gain must be zero before start")
             
-        # Set the Mask based on ear
-        if earside == 'left':
-            self.channel_mask = np.array([1.0, 0.0]) # Left ONLY
-        elif earside == 'right':
-            self.channel_mask = np.array([0.0, 1.0]) # Right ONLY
-        else:
-            raise ValueError(f"Invalid earside: {earside}")
+        # Set the Mask based on ear. This is the only place the ear is
+        # looked at: the callback just multiplies by the mask, so choosing
+        # the channel costs nothing per buffer
+        try:
+            self.channel_mask = _EARSIDE_MASKS[earside]
+        except (KeyError, TypeError):
+            raise ValueError(f"Invalid earside: {earside}") from None
+
+        if not HAS_NUMBA:
+            # Same expression as the callback's, so the step compares equal
+            phase_inc = self._two_pi_over_sr * freq
+            if self._sine_tables[0] != phase_inc:
+                self._sine_tables = self._make_sine_tables(
+                    phase_inc, len(self._scratch_n))
 
         target_gain = _db2lin(gain_db)
         slope = target_gain / self._attack
@@ -91,6 +223,10 @@ class AudioStream:
         # Keep freq, update gain/slope
         self._callback_parameters = target_gain, slope, self._callback_parameters[2]
 
+    def is_playing(self):
+        """Return True while a tone is active (target gain not yet zero)."""
+        return self._target_gain != 0
+
     def close(self):
         self._stream.stop()
         self._stream.close()
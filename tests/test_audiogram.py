@@ -0,0 +1,132 @@
+"""Unit tests for the audiogram module."""
+
+import unittest
+from unittest.mock import patch
+import subprocess
+import sys
+import os
+import tempfile
+import shutil
+
+# Add parent directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from audiometer import audiogram
+
+
+CSV_CONTENT = """Conduction,air,
+Masking,off,
+Level/dB,Frequency/Hz,Earside
+20,1000,right
+25,500,right
+30,1000,left
+35,4000,left
+"""
+
+
+class TestMakeAudiogram(unittest.TestCase):
+    """Test audiogram rendering from result CSVs."""
+
+    def setUp(self):
+        self.results_path = tempfile.mkdtemp()
+        with open(os.path.join(self.results_path, 'result.csv'), 'w') as f:
+            f.write(CSV_CONTENT)
+
+    def tearDown(self):
+        shutil.rmtree(self.results_path, ignore_errors=True)
+
+    def test_read_audiogram_groups_by_ear(self):
+        """Measurements are grouped per ear and sorted by frequency."""
+        metadata, measurements = audiogram._read_audiogram(
+            'result.csv', self.results_path)
+
+        self.assertEqual(metadata, {'Conduction': 'air', 'Masking': 'off'})
+        for earside, expected in (('right', ([25.0, 20.0], [500, 1000])),
+                                  ('left', ([30.0, 35.0], [1000, 4000]))):
+            dBHL, freqs = measurements[earside]
+            self.assertEqual((dBHL.tolist(), freqs.tolist()), expected)
+
+    def test_read_audiogram_without_pandas_matches(self):
+        """The csv-module fallback groups the rows the same way."""
+        with_pandas = audiogram._read_audiogram('result.csv', self.results_path)
+        with patch.object(audiogram, 'HAS_PANDAS', False):
+            without = audiogram._read_audiogram('result.csv', self.results_path)
+
+        self.assertEqual(with_pandas[0], without[0])
+        for earside in ('right', 'left'):
+            for got, expected in zip(without[1][earside],
+                                     with_pandas[1][earside]):
+                self.assertEqual(got.tolist(), expected.tolist())
+
+    def test_make_audiogram_writes_pdf_and_png(self):
+        """Both output files are written next to the CSV."""
+        audiogram.make_audiogram('result.csv', self.results_path)
+
+        for ext in ('.pdf', '.png'):
+            path = os.path.join(self.results_path, 'result' + ext)
+            self.assertTrue(os.path.exists(path))
+            self.assertGreater(os.path.getsize(path), 0)
+
+    def test_make_audiogram_writes_only_requested_outputs(self):
+        """Formats left out of outputs are not rendered."""
+        audiogram.make_audiogram('result.csv', self.results_path,
+                                 outputs=('png',))
+
+        self.assertTrue(os.path.exists(
+            os.path.join(self.results_path, 'result.png')))
+        self.assertFalse(os.path.exists(
+            os.path.join(self.results_path, 'result.pdf')))
+
+    def test_make_audiogram_writes_svg(self):
+        """SVG output is a vector file and skips the PNG."""
+        audiogram.make_audiogram('result.csv', self.results_path,
+                                 outputs=('svg',))
+
+        with open(os.path.join(self.results_path, 'result.svg')) as f:
+            self.assertIn('<svg', f.read())
+        self.assertFalse(os.path.exists(
+            os.path.join(self.results_path, 'result.png')))
+
+    def test_make_audiogram_rejects_unknown_output(self):
+        """An unsupported format is reported before anything is rendered."""
+        with self.assertRaises(ValueError):
+            audiogram.make_audiogram('result.csv', self.results_path,
+                                     outputs=('jpg',))
+
+    def test_make_audiogram_reuses_template_without_stale_lines(self):
+        """A second render of the same layout draws on a clean template."""
+        audiogram.make_audiogram('result.csv', self.results_path)
+        audiogram.make_audiogram('result.csv', self.results_path)
+
+        layout = (('right', (500, 1000)), ('left', (1000, 4000)))
+        f, axes, lock = audiogram._template_figure(layout)
+        self.assertEqual([len(ax.get_lines()) for ax in axes.values()], [0, 0])
+
+    @patch.dict(os.environ, {'AUDIO_METER_SINGLECORE': '1'})
+    def test_make_audiogram_async_singlecore_runs_inline(self):
+        """With AUDIO_METER_SINGLECORE=1 the render finishes before returning."""
+        with patch.object(audiogram, '_get_executor') as get_executor:
+            future = audiogram.make_audiogram_async('result.csv',
+                                                    self.results_path)
+
+        get_executor.assert_not_called()
+        self.assertTrue(future.done())
+        self.assertTrue(os.path.exists(
+            os.path.join(self.results_path, 'result.png')))
+
+
+class TestAudiogramImports(unittest.TestCase):
+    """Test what importing the module pulls in."""
+
+    def test_import_does_not_load_pyplot(self):
+        """Render workers only need Figure/FigureCanvasAgg, never pyplot."""
+        repo_root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+        code = ("import sys, audiometer.audiogram; "
+                "assert 'matplotlib.pyplot' not in sys.modules")
+        result = subprocess.run([sys.executable, '-c', code], cwd=repo_root,
+                                capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
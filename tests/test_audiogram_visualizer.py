@@ -85,7 +85,12 @@ Level/dB,Frequency/Hz,Earside
         # Check right ear data
         right_data = [d for d in plotter.data if d['Earside'] == 'right']
         assert len(right_data) == 3
-    
+
+        # Columnar copy mirrors the row data (0 = left, 1 = right)
+        assert len(plotter.data_np) == 6
+        assert list(plotter.data_np['ear']) == [0, 0, 0, 1, 1, 1]
+        assert list(plotter.data_np['level'][:3]) == [20, 25, 30]
+
     def test_parse_csv_minimal(self, minimal_csv_file):
         """Test parsing CSV with no metadata (only header + data)."""
         plotter = AudiogramPlotter(minimal_csv_file)
@@ -206,8 +211,37 @@ Level/dB,Frequency/Hz,Earside
         assert summary['right_ear_measurements'] == 5
         assert 'metadata' in summary
         assert 'frequencies_tested' in summary
-        
+
+        sample_plotter.close()
+
+    def test_plotters_keep_separate_figures(self, sample_plotter, tmp_path):
+        """Test that a second plotter does not overwrite the first one's figure."""
+        csv_file = tmp_path / "other.csv"
+        csv_file.write_text("Level/dB,Frequency/Hz,Earside\n60,2000,Right\n")
+        other = AudiogramPlotter(str(csv_file))
+
+        fig = sample_plotter.plot_audiogram()
+        other_fig = other.plot_audiogram()
+        assert fig is not other_fig
+
+        ears = sample_plotter._chart['ears']
+        assert len(ears['left'][1].get_offsets()) == 5
+        assert len(ears['right'][1].get_offsets()) == 5
+        other_ears = other._chart['ears']
+        assert len(other_ears['left'][1].get_offsets()) == 0
+        assert other_ears['right'][1].get_offsets().tolist() == [[2000, 60]]
+
+        sample_plotter.close()
+        other.close()
+
+    def test_replot_reuses_figure(self, sample_plotter):
+        """Test that plotting twice redraws the same figure without extra legends."""
+        fig = sample_plotter.plot_audiogram()
+        assert sample_plotter.plot_audiogram() is fig
+        assert len(fig.axes[0].get_legend().get_texts()) == 2
+
         sample_plotter.close()
+        assert sample_plotter._figure is None
 
 
 class TestEdgeCases:
@@ -42,6 +42,50 @@ class TestControllerConfig(unittest.TestCase):
             config = controller.config()
             self.assertEqual(config.beginning_fam_level, 30)
 
+    def test_config_results_are_independent(self):
+        """Test that memoized parses hand out separate, fresh configs."""
+        first = controller.config(args=['--quick-mode'])
+        first.freqs.append(8000)
+        first.earsides[0] = 'left'
+
+        second = controller.config(args=['--quick-mode'])
+        self.assertEqual(second.freqs, [1000, 2000, 4000, 500])
+        self.assertEqual(second.earsides, ['right', 'left'])
+        self.assertTrue(second.filename.startswith('result_'))
+        self.assertTrue(second.filename.endswith('.csv'))
+
+
+class TestControllerCarryOn(unittest.TestCase):
+    """Test resuming an earlier session with --carry-on."""
+
+    def setUp(self):
+        self.results_path = tempfile.mkdtemp()
+        with open(os.path.join(self.results_path, 'result.csv'), 'w') as f:
+            f.write('Conduction,air,\nMasking,off,\n'
+                    'Level/dB,Frequency/Hz,Earside\n'
+                    '20,1000,right\n25,2000,left\n')
+
+    def tearDown(self):
+        shutil.rmtree(self.results_path, ignore_errors=True)
+
+    @patch('audiometer.tone_generator.AudioStream')
+    @patch('audiometer.responder.Responder')
+    def test_carry_on_resumes_after_last_row(self, mock_responder, mock_audio):
+        """Test that the last row picks the next frequency and appends to it."""
+        carry_on = controller.config(args=['--carry-on', 'result.csv',
+                                           '--results-path', self.results_path])
+
+        with patch('audiometer.controller.config', return_value=carry_on):
+            ctrl = controller.Controller()
+            self.assertEqual(ctrl.config.freqs, [4000, 500])
+            self.assertEqual(ctrl.config.earsides[0], 'left')
+            ctrl.writer.writerow([30, 4000, 'left'])
+            ctrl.csvfile.close()
+
+        with open(os.path.join(self.results_path, 'result.csv')) as f:
+            self.assertEqual(f.read().splitlines()[-2:],
+                             ['25,2000,left', '30,4000,left'])
+
 
 class TestControllerDBHL(unittest.TestCase):
     """Test dBHL to dBFS conversion."""
@@ -67,6 +111,36 @@ class TestControllerDBHL(unittest.TestCase):
                     self.assertIsInstance(result, (int, float))
 
 
+class TestControllerDevices(unittest.TestCase):
+    """Test when the audio stream and responder are opened."""
+
+    @patch('audiometer.tone_generator.AudioStream')
+    @patch('audiometer.responder.Responder')
+    @patch('sys.argv', ['test_script.py'])
+    def test_stream_opened_eagerly_responder_lazily(self, mock_responder, mock_audio):
+        """Test that construction opens the stream but not the responder."""
+        with patch('os.path.exists', return_value=True):
+            with patch('builtins.open', MagicMock()):
+                with patch('csv.writer'):
+                    ctrl = controller.Controller()
+                    mock_audio.assert_called_once()
+                    mock_responder.assert_not_called()
+
+                    self.assertIs(ctrl._rpd, ctrl._rpd)
+                    mock_responder.assert_called_once()
+
+    @patch('audiometer.tone_generator.AudioStream',
+           side_effect=RuntimeError("No output device"))
+    @patch('sys.argv', ['test_script.py'])
+    def test_device_error_fails_construction(self, mock_audio):
+        """Test that a stream that cannot be opened fails the Controller."""
+        with patch('os.path.exists', return_value=True):
+            with patch('builtins.open', MagicMock()):
+                with patch('csv.writer'):
+                    with self.assertRaises(RuntimeError):
+                        controller.Controller()
+
+
 class TestControllerClicktone(unittest.TestCase):
     """Test clicktone method."""
 
@@ -97,7 +171,7 @@ class TestControllerClicktone(unittest.TestCase):
     @patch('audiometer.responder.Responder')
     @patch('sys.argv', ['test_script.py'])
     @patch('time.sleep')
-    @patch('time.time')
+    @patch('time.monotonic')
     def test_clicktone_with_button_press(self, mock_time, mock_sleep, mock_responder, mock_audio):
         """Test clicktone when button is pressed quickly."""
         mock_resp_instance = MagicMock()
@@ -121,6 +195,29 @@ class TestControllerClicktone(unittest.TestCase):
                     # Should return True for quick press
                     self.assertTrue(result)
 
+    @patch('audiometer.tone_generator.AudioStream')
+    @patch('audiometer.responder.Responder')
+    @patch('sys.argv', ['test_script.py'])
+    @patch('time.sleep')
+    @patch('time.monotonic')
+    def test_clicktone_with_long_button_press(self, mock_time, mock_sleep, mock_responder, mock_audio):
+        """Test clicktone when the button is held longer than the tolerance."""
+        mock_resp_instance = MagicMock()
+        mock_resp_instance.click_down.return_value = True
+        mock_responder.return_value = mock_resp_instance
+        mock_audio.return_value = MagicMock()
+
+        mock_time.side_effect = [0, 2.0]  # 2 second press (tolerance = 1.5)
+
+        with patch('os.path.exists', return_value=True):
+            with patch('builtins.open', MagicMock()):
+                with patch('csv.writer'):
+                    ctrl = controller.Controller()
+                    result = ctrl.clicktone(1000, 50, 'right')
+
+                    # Should return False for a press held too long
+                    self.assertFalse(result)
+
 
 class TestAudiblTone(unittest.TestCase):
     """Test audibletone method."""
@@ -362,6 +362,42 @@ class TestPartialResults(unittest.TestCase):
                 self.fail(f"CSV file should not be corrupted: {e}")
 
 
+
+@patch('audiometer.controller.os.path.exists', return_value=True)
+@patch('audiometer.controller.os.makedirs')
+@patch('audiometer.controller.responder.Responder')
+class TestAudioDeviceErrors(unittest.TestCase):
+    """Test that audio device failures are not mistaken for a finished test."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.test_dir)
+
+        mock_config_obj = MagicMock()
+        mock_config_obj.results_path = self.test_dir
+        mock_config_obj.filename = 'test_result.csv'
+        mock_config_obj.device = None
+        mock_config_obj.freqs = [1000, 2000]
+        mock_config_obj.earsides = ['right', 'left']
+        mock_config_obj.carry_on = None
+        mock_config_obj.logging = False
+        mock_config_obj.cal_parameters = []
+        patcher = patch('audiometer.controller.config',
+                        return_value=mock_config_obj)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch('audiometer.controller.tone_generator.AudioStream',
+           side_effect=RuntimeError("No output device"))
+    def test_device_error_aborts_test_creation(self, mock_audio_class, *mocks):
+        """A stream that cannot be opened fails before any frequency is tested."""
+        with patch.object(controller.Controller, 'save_results') as mock_save:
+            with self.assertRaises(RuntimeError):
+                AscendingMethod(device_id=None, subject_name="DeviceTest")
+
+        mock_save.assert_not_called()
+
 if __name__ == '__main__':
     unittest.main()
 
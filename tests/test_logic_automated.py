@@ -19,6 +19,7 @@ import time
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+import ascending_method
 from ascending_method import AscendingMethod
 from audiometer import controller
 from audiometer import audiogram
@@ -174,6 +175,51 @@ class TestHughsonWestlakeLogic(unittest.TestCase):
                            f"Expected level {expected_level}dB, got {test.current_level}dB")
             print(f"  ✓ Level correctly increased from {initial_level}dB to {test.current_level}dB (+5dB)")
 
+    def test_steps_after_stop_raise_and_stop_audio_once(self):
+        """Test that single steps honour a stop through the shared checkpoint."""
+        with patch('audiometer.controller.Controller') as MockController:
+            mock_ctrl = MockController.return_value
+            mock_ctrl.config.small_level_increment = 5
+            mock_ctrl.config.small_level_decrement = 10
+            mock_ctrl.clicktone = Mock(return_value=True)
+
+            test = AscendingMethod(device_id=None, subject_name=None)
+            test.ctrl = mock_ctrl
+            test.freq = 1000
+            test.earside = 'right'
+            test.current_level = 40
+            test.stop_event.set()
+
+            with self.assertRaises(ascending_method.TestStopped):
+                test.decrement_click(10)
+            with self.assertRaises(ascending_method.TestStopped):
+                test.increment_click(5)
+
+            mock_ctrl.clicktone.assert_not_called()
+            mock_ctrl.stop_audio_immediately.assert_called_once()
+            self.assertEqual(test.current_level, 40)
+
+    def test_single_steps_match_stepper_iterations(self):
+        """Test that single steps trace and present tones like _step_until."""
+        with patch('audiometer.controller.Controller') as MockController:
+            mock_ctrl = MockController.return_value
+            mock_ctrl.clicktone = Mock(return_value=False)
+
+            test = AscendingMethod(device_id=None, subject_name=None)
+            test.ctrl = mock_ctrl
+            test.freq = 1000
+            test.earside = 'right'
+            test.current_level = 40
+            test._sub_step_counter = 0
+
+            test.decrement_click(10)
+            test.increment_click(20)
+
+            self.assertEqual(list(test._trace), [-10, 20])
+            self.assertEqual(test.current_level, 50)
+            mock_ctrl.clicktone.assert_called_with(1000, 50, 'right',
+                                                   test.stop_event)
+
 
 class TestProgressCalculation(unittest.TestCase):
     """Test progress tracking and calculation."""
@@ -299,6 +345,31 @@ class TestProgressCalculation(unittest.TestCase):
             print(f"  ✓ Progress: {completed}/{total} = {percentage}%")
 
 
+    def test_completed_step_posted_after_in_frequency_progress(self):
+        """Test that a finished step reaches the UI even at the same whole percent."""
+        with patch('audiometer.controller.Controller') as MockController:
+            mock_ctrl = MockController.return_value
+            # 200 steps: each one is worth half a percent
+            mock_ctrl.config.freqs = list(range(100))
+            mock_ctrl.config.earsides = ['right', 'left']
+
+            posted = []
+            test = AscendingMethod(device_id=None, subject_name=None,
+                                   progress_callback=posted.append)
+            test._current_earside = 'right'
+            test._current_freq = 1000
+            test._completed_steps = test._current_step = 2
+
+            # Far more tones than estimated: still capped below the next step
+            test._report_granular_progress(10 * test.ESTIMATED_TRIALS_PER_FREQ)
+            test._update_progress()
+            test._flush_callbacks()
+
+            self.assertEqual([round(p, 6) for p in posted], [1.45, 1.5])
+            mock_ctrl.ui_window.write_event_value.assert_called_once_with(
+                '-PROGRESS-', 1)
+
+
 class TestFileGeneration(unittest.TestCase):
     """Test file generation with user folder structure."""
     
@@ -348,12 +419,14 @@ class TestFileGeneration(unittest.TestCase):
             mock_responder = MagicMock()
             mock_responder_class.return_value = mock_responder
             
+            # The controller rewrites results_path, so take the base first
+            user_folder_path = os.path.join(mock_config_obj.results_path, sanitized_name)
+
             # Create controller with subject name
             ctrl = controller.Controller(device_id=None, subject_name=subject_name)
             
             # Verify makedirs was called to create user folder
-            user_folder_path = os.path.join(mock_config_obj.results_path, sanitized_name)
-            mock_makedirs.assert_called_with(user_folder_path)
+            mock_makedirs.assert_called_with(user_folder_path, exist_ok=True)
             print(f"  ✓ User folder creation called: {user_folder_path}")
             
             # Verify results_path was updated
@@ -478,6 +551,20 @@ class TestFileGeneration(unittest.TestCase):
             self.assertEqual(call_args[0][1], user_folder)
             print(f"  ✓ make_audiogram called with: {call_args[0][0]}, {call_args[0][1]}")
 
+    @patch('audiometer.audiogram.make_audiogram',
+           side_effect=RuntimeError("render failed"))
+    def test_audiogram_failure_raises_from_exit(self, mock_make_audiogram):
+        """Test that a failed audiogram render is not swallowed by __exit__."""
+        with patch('audiometer.controller.Controller') as MockController:
+            mock_ctrl = MockController.return_value
+            mock_ctrl.config.freqs = [1000]
+            mock_ctrl.config.earsides = ['right']
+
+            test = AscendingMethod(device_id=None, subject_name=None)
+            with self.assertRaises(RuntimeError):
+                test.__exit__(None, None, None)
+            mock_ctrl.__exit__.assert_called_once()
+
 
 def run_tests():
     """Run all automated tests."""
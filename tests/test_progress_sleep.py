@@ -1,5 +1,6 @@
 import os
 import sys
+import threading
 import time
 
 # Make repo importable
@@ -30,3 +31,20 @@ def test_progress_sleep_does_not_emit_progress_events():
 
     # No '-PROGRESS-' events should have been emitted during the tone
     assert all(evt[0] != '-PROGRESS-' for evt in c.ui_window.events)
+
+
+def test_progress_sleep_returns_as_soon_as_stop_is_set():
+    c = Controller()
+    stop_event = threading.Event()
+    threading.Timer(0.05, stop_event.set).start()
+
+    start = time.monotonic()
+    completed = c._progress_sleep(5, stop_event)
+
+    assert completed is False
+    assert time.monotonic() - start < 1
+
+
+def test_progress_sleep_completes_without_stop():
+    c = Controller()
+    assert c._progress_sleep(0.05, threading.Event()) is True
@@ -82,8 +82,67 @@ class TestResponder(unittest.TestCase):
         responder.ui_button_released()
         self.assertTrue(responder.click_up())
 
+    def test_wait_for_click_down_and_up_sees_quick_click(self):
+        """A click pressed and released before the waiter wakes still counts."""
+        import threading
+
+        responder = Responder(self.tone_duration)
+
+        def click():
+            responder.ui_button_pressed()
+            responder.ui_button_released()
+
+        timer = threading.Timer(0.05, click)
+        timer.start()
+        self.assertTrue(responder.wait_for_click_down_and_up(timeout=2))
+        timer.join()
+
+        # No further click: times out
+        self.assertFalse(responder.wait_for_click_down_and_up(timeout=0.05))
+
+    def test_close_unhooks_only_own_handlers(self):
+        """close() unhooks each registered handler once, never unhook_all()."""
+        from types import SimpleNamespace
+        unhooked = []
+
+        mock_keyboard = SimpleNamespace(
+            hook=lambda handler, suppress=False: handler,
+            unhook=unhooked.append,
+            unhook_all=Mock()
+        )
+
+        with patch.dict('sys.modules', {'keyboard': mock_keyboard}):
+            responder = Responder(self.tone_duration)
+            handlers = list(responder._handlers)
+            responder.close()
+
+        self.assertEqual(unhooked, handlers)
+        mock_keyboard.unhook_all.assert_not_called()
+        self.assertEqual(responder._handlers, [])
+
+    def test_registered_handlers_do_not_keep_responder_alive(self):
+        """The keyboard registry holds the handlers, not the Responder."""
+        from types import SimpleNamespace
+        import weakref
+        registry = []
+
+        def hook(handler, suppress=False):
+            registry.append(handler)
+            return handler
+
+        mock_keyboard = SimpleNamespace(hook=hook, unhook=lambda h: None)
+
+        with patch.dict('sys.modules', {'keyboard': mock_keyboard}):
+            responder = Responder(self.tone_duration)
+        ref = weakref.ref(responder)
+        del responder
+
+        self.assertIsNone(ref())
+        # A leftover handler is harmless once its Responder is gone
+        registry[0](SimpleNamespace(name='volume up', event_type='down'))
+
     def test_registers_media_keys_with_hook_api(self):
-        """If keyboard provides a hook() API, responder should register two handlers and receive events."""
+        """If keyboard provides a hook() API, responder should register one dispatching handler and receive events."""
         from types import SimpleNamespace
         captured = []
 
@@ -103,19 +162,20 @@ class TestResponder(unittest.TestCase):
         with patch.dict('sys.modules', {'keyboard': mock_keyboard}):
             responder = Responder(self.tone_duration)
 
-            # Expect two handlers registered via hook()
-            self.assertEqual(len(responder._handlers), 2)
-            # Both handlers should have been requested with suppression=True
+            # Expect a single handler registered via hook(), with suppression
+            self.assertEqual(len(responder._handlers), 1)
             self.assertTrue(all(suppress for (_h, suppress) in captured))
-
-            # Simulate a press event (down) on the first handler
             handler_func = captured[0][0]
-            handler_func(SimpleNamespace(event_type='down'))
-            self.assertTrue(responder.click_down())
 
-            # Simulate release via second handler
-            handler_func_release = captured[1][0]
-            handler_func_release(SimpleNamespace(event_type='up'))
+            # Other keys pass through (truthy return) and are not a response
+            self.assertTrue(handler_func(SimpleNamespace(name='a', event_type='down')))
+            self.assertFalse(responder.click_down())
+
+            # Simulate a media key press (down), then its release (up)
+            handler_func(SimpleNamespace(name='volume up', event_type='down'))
+            self.assertTrue(responder.click_down())
+            self.assertFalse(responder.click_up())
+            handler_func(SimpleNamespace(name='volume up', event_type='up'))
             self.assertTrue(responder.click_up())
 
     def test_registers_without_suppress_kwarg(self):
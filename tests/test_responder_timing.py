@@ -67,7 +67,8 @@ class FakeControllerForClickTest:
             release_ts = getattr(self._rpd, '_last_release_time', None)
 
             if press_ts is not None and release_ts is not None:
-                duration = release_ts - press_ts
+                # Timestamps are monotonic_ns() integers
+                duration = (release_ts - press_ts) / 1e9
             else:
                 # Fallback: measure elapsed time around wait_for_click_up
                 start = time.time()
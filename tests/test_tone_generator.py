@@ -132,6 +132,20 @@ class TestToneGenerator(unittest.TestCase):
 
         self.assertEqual(audio._channel, 1)
 
+    @patch('audiometer.tone_generator.sd.OutputStream')
+    def test_audiostream_is_playing(self, mock_stream_class):
+        """is_playing() follows start()/stop()."""
+        mock_stream_class.return_value = MagicMock()
+
+        audio = tone_generator.AudioStream(device=None, attack=30, release=40)
+        self.assertFalse(audio.is_playing())
+
+        audio.start(freq=1000, gain_db=-20, earside='right')
+        self.assertTrue(audio.is_playing())
+
+        audio.stop()
+        self.assertFalse(audio.is_playing())
+
     @patch('audiometer.tone_generator.sd.OutputStream')
     def test_audiostream_context_manager(self, mock_stream_class):
         """Test AudioStream as context manager."""
@@ -153,7 +167,6 @@ class TestToneGenerator(unittest.TestCase):
         # Simulate parameters like after start(): explicitly set the channel mask
         audio.channel_mask = np.array([1.0, 0.0], dtype=float)
         audio._callback_parameters = (1.0, 0.1, 1000)
-        audio._index = 0
         audio._last_gain = 0
 
         frames = 16
@@ -174,7 +187,6 @@ class TestToneGenerator(unittest.TestCase):
         # Simulate parameters like after start(): explicitly set the channel mask
         audio.channel_mask = np.array([0.0, 1.0], dtype=float)
         audio._callback_parameters = (1.0, 0.1, 1000)
-        audio._index = 0
         audio._last_gain = 0
 
         frames = 16
@@ -186,5 +198,67 @@ class TestToneGenerator(unittest.TestCase):
         self.assertTrue((outdata[:, 0] == 0).all())
 
 
+    @patch('audiometer.tone_generator.sd.OutputStream')
+    def test_callback_phase_continues_across_buffers(self, mock_stream_class):
+        """Two short buffers should join into the same sine as one long one."""
+        mock_stream_class.return_value = MagicMock()
+
+        def render(buffer_sizes):
+            audio = tone_generator.AudioStream(device=None, attack=30, release=40)
+            audio.start(freq=1000, gain_db=-20, earside='left')
+            chunks = []
+            for frames in buffer_sizes:
+                outdata = np.zeros((frames, 2), dtype=float)
+                audio._callback(outdata, frames, None, tone_generator.sd.CallbackFlags())
+                chunks.append(outdata)
+            return np.concatenate(chunks)
+
+        np.testing.assert_allclose(render([256, 256]), render([512]), atol=1e-6)
+
+    @patch('audiometer.tone_generator.sd.OutputStream')
+    def test_render_kernel_matches_numpy_path(self, mock_stream_class):
+        """The fused _render loop and the NumPy fallback produce the same tone."""
+        mock_stream_class.return_value = MagicMock()
+
+        def render(use_kernel):
+            with patch.object(tone_generator, 'HAS_NUMBA', use_kernel):
+                audio = tone_generator.AudioStream(device=None, attack=30, release=40)
+                audio.start(freq=1000, gain_db=-20, earside='right')
+                chunks = []
+                for step in range(6):
+                    if step == 4:
+                        audio.stop()
+                    outdata = np.zeros((512, 2), dtype=np.float32)
+                    audio._callback(outdata, 512, None, tone_generator.sd.CallbackFlags())
+                    chunks.append(outdata)
+            return np.concatenate(chunks)
+
+        kernel = render(True)
+        np.testing.assert_allclose(kernel, render(False), atol=1e-6)
+        self.assertTrue((kernel[:, 0] == 0).all())
+
+    @patch('audiometer.tone_generator.sd.OutputStream')
+    def test_numpy_path_follows_frequency_change(self, mock_stream_class):
+        """The cached sine tables are rebuilt when the next tone changes pitch."""
+        mock_stream_class.return_value = MagicMock()
+        with patch.object(tone_generator, 'HAS_NUMBA', False):
+            audio = tone_generator.AudioStream(device=None, attack=1, release=1)
+            for freq in (1000, 2000):
+                audio.start(freq=freq, gain_db=-20, earside='left')
+                # Tables are built by start(), never in the callback
+                tables = audio._sine_tables
+                self.assertIsNotNone(tables[0])
+                outdata = np.zeros((512, 2), dtype=np.float32)
+                audio._callback(outdata, 512, None, tone_generator.sd.CallbackFlags())
+                # Past the 1 ms attack, the buffer is a plain sine at full gain
+                phase = audio._phase
+                audio._callback(outdata, 512, None, tone_generator.sd.CallbackFlags())
+                expected = audio._target_gain * np.sin(
+                    phase + 2 * np.pi * freq * np.arange(512) / audio.samplerate)
+                np.testing.assert_allclose(outdata[:, 0], expected, atol=1e-6)
+                self.assertIs(audio._sine_tables, tables)
+                audio.stop()
+                audio._callback(outdata, 512, None, tone_generator.sd.CallbackFlags())
+
 if __name__ == '__main__':
     unittest.main()
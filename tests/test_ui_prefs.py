@@ -34,6 +34,22 @@ class TestUIPrefsPersistence(unittest.TestCase):
         self.assertIn('win_focus', loaded)
         self.assertIn('high_contrast', loaded)
 
+    def test_load_returns_independent_copies(self):
+        config.save_prefs({'theme': 'litera'})
+        first = config.load_prefs()
+        first['theme'] = 'changed'
+        self.assertEqual(config.load_prefs()['theme'], 'litera')
+
+    def test_load_sees_external_changes(self):
+        config.save_prefs({'theme': 'litera'})
+        self.assertEqual(config.load_prefs()['theme'], 'litera')
+        # Rewrite the file behind the cache's back
+        p = config.get_config_path()
+        p.write_text('{"theme": "cyborg", "extra": 1}', encoding='utf-8')
+        loaded = config.load_prefs()
+        self.assertEqual(loaded['theme'], 'cyborg')
+        self.assertEqual(loaded['extra'], 1)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -37,7 +37,6 @@ class TestAudioIsolation(unittest.TestCase):
     def _call_callback(self, stream, frames=64):
         outdata = np.zeros((frames, 2), dtype=np.float32)
         # status can be 0 or a CallbackFlags instance; use 0 here
-        stream._index = 0
         # Use a CallbackFlags instance for status to avoid type errors
         status = stream._callback_status.__class__() if hasattr(stream, '_callback_status') else 0
         stream._callback(outdata, frames, None, status)